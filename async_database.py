@@ -0,0 +1,101 @@
+import asyncio
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Dict, Optional
+
+from database_operations import DatabaseManager, db_manager
+
+# DatabaseManager methods exposed as coroutines, by name prefix
+_READ_PREFIXES = ("get_", "list_", "count_", "search_", "suggest_")
+_WRITE_PREFIXES = ("add_", "bulk_add_", "update_", "transfer_", "terminate_")
+_NOT_EXPOSED = {"get_connection"}
+
+
+class _Call:
+    """One read running on a worker thread, so a cancelled caller can interrupt it"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.connection = None
+        self.cancelled = False
+
+    def run(self, connection: sqlite3.Connection, method: Callable, args: tuple, kwargs: Dict):
+        with self.lock:
+            if self.cancelled:
+                return None
+            self.connection = connection
+        try:
+            return method(*args, **kwargs)
+        finally:
+            with self.lock:
+                self.connection = None
+
+    def interrupt(self):
+        # Holding the lock keeps the worker from moving on to its next call,
+        # so the interrupt can only land on this call's statement.
+        with self.lock:
+            self.cancelled = True
+            if self.connection is not None:
+                self.connection.interrupt()
+
+
+class AsyncDatabaseManager:
+    """asyncio facade over DatabaseManager for tools outside the Streamlit app.
+
+    Every getter and writer of DatabaseManager is available as a coroutine of
+    the same name. The facade wraps an existing manager (the app's db_manager
+    by default), so it shares that manager's cache and single writer thread.
+    Calls run on a dedicated executor whose threads each check out their own
+    pooled connection, and at most max_concurrency of them run at once.
+    Cancelling a read interrupts its SQLite statement; cancelling a write
+    only stops waiting for it, because writes are applied by the writer
+    thread together with other queued jobs.
+    """
+
+    def __init__(self, manager: Optional[DatabaseManager] = None, max_concurrency: int = 4):
+        self.db = manager or db_manager
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="async-db")
+        self._slots = asyncio.Semaphore(max_concurrency)
+
+    def __getattr__(self, name: str):
+        if name.startswith("_") or name in _NOT_EXPOSED:
+            raise AttributeError(name)
+        if not name.startswith(_READ_PREFIXES + _WRITE_PREFIXES):
+            raise AttributeError(f"{type(self).__name__} does not expose {name!r}")
+        method = getattr(self.db, name)
+        if not callable(method):
+            raise AttributeError(name)
+        return partial(self.call, name)
+
+    async def call(self, name: str, *args, **kwargs):
+        """Run the DatabaseManager method `name` on the executor and await its result"""
+        method = getattr(self.db, name)
+        interruptible = name.startswith(_READ_PREFIXES)
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            call = _Call()
+            future = loop.run_in_executor(self._executor, self._run, call, method, args, kwargs)
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if interruptible:
+                    call.interrupt()
+                # Keep the slot until the worker is free again
+                await asyncio.gather(future, return_exceptions=True)
+                raise
+
+    def _run(self, call: _Call, method: Callable, args: tuple, kwargs: Dict):
+        return call.run(self.db.get_connection(), method, args, kwargs)
+
+    async def close(self):
+        """Wait for running calls to finish and stop the executor (the manager stays open)"""
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
@@ -3,16 +3,17 @@ import hashlib
 import sqlite3
 from typing import Optional, Dict
 import os
+from database_operations import db_manager
 
 class AuthComponent:
     def __init__(self):
-        self.db_path = "court_management.db"
+        self.db_path = db_manager.db_path
         self.init_auth_table()
     
     def init_auth_table(self):
         """Initialize the users table if it doesn't exist"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_manager.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     CREATE TABLE IF NOT EXISTS users (
@@ -40,7 +41,7 @@ class AuthComponent:
     def create_default_admin(self):
         """Create default admin user"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_manager.get_connection() as conn:
                 cursor = conn.cursor()
                 admin_password = "admin123"  # Default password
                 password_hash = hashlib.sha256(admin_password.encode()).hexdigest()
@@ -66,7 +67,7 @@ class AuthComponent:
     def login(self, username: str, password: str) -> Optional[Dict]:
         """Authenticate user and return user data if successful"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_manager.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT id, username, full_name, role, email, is_active
@@ -81,12 +82,11 @@ class AuthComponent:
                     password_hash = cursor.fetchone()[0]
                     
                     if self.verify_password(password, password_hash):
-                        # Update last login
-                        cursor.execute("""
+                        # Update last login through the shared writer thread
+                        db_manager.writer.execute("""
                             UPDATE users SET last_login = CURRENT_TIMESTAMP 
                             WHERE username = ?
                         """, (username,))
-                        conn.commit()
                         
                         return {
                             'id': user[0],
@@ -104,7 +104,7 @@ class AuthComponent:
     def register_user(self, username: str, password: str, full_name: str, role: str, email: str = None) -> bool:
         """Register a new user (admin only)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_manager.get_connection() as conn:
                 cursor = conn.cursor()
                 password_hash = self.hash_password(password)
                 
@@ -125,7 +125,7 @@ class AuthComponent:
     def get_all_users(self) -> list:
         """Get all users (admin only)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_manager.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT id, username, full_name, role, email, created_at, last_login, is_active
@@ -284,7 +284,7 @@ class AuthComponent:
             
             # Verify current password and update
             try:
-                with sqlite3.connect(self.db_path) as conn:
+                with db_manager.get_connection() as conn:
                     cursor = conn.cursor()
                     
                     # Get current password hash
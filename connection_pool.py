@@ -0,0 +1,79 @@
+import sqlite3
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class ConnectionPool:
+    """Pool of persistent SQLite connections, one checked out per thread.
+
+    Streamlit runs every session (and every rerun) on its own script thread.
+    Each thread gets a dedicated connection the first time it asks for one and
+    keeps it for as long as the thread is alive; connections owned by threads
+    that have finished are rolled back and handed to the next new thread, so
+    the PRAGMA setup below only ever runs once per physical connection.
+    """
+
+    def __init__(self, db_path: str, busy_timeout: int = 5000, cache_size: int = -16000,
+                 mmap_size: int = 64 * 1024 * 1024, journal_mode: str = "WAL", max_idle: int = 8,
+                 detect_types: int = sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+                 trace_callback: Optional[Callable[[str], None]] = None):
+        self.db_path = db_path
+        self.busy_timeout = busy_timeout      # milliseconds
+        self.cache_size = cache_size          # negative values are KiB, as in PRAGMA cache_size
+        self.mmap_size = mmap_size            # bytes, 0 disables memory-mapped I/O
+        self.journal_mode = journal_mode
+        self.max_idle = max_idle
+        self.detect_types = detect_types      # typed decoding via sqlite3.register_converter
+        self.trace_callback = trace_callback  # called with every statement run (query metrics)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._owners: Dict[int, Tuple[threading.Thread, sqlite3.Connection]] = {}
+        self._idle: List[sqlite3.Connection] = []
+
+    def connection(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, checking one out if needed"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+
+        thread = threading.current_thread()
+        with self._lock:
+            self._reclaim_dead_owners()
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            conn = self._connect()
+        with self._lock:
+            self._owners[thread.ident] = (thread, conn)
+        self._local.conn = conn
+        return conn
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection and apply the per-connection PRAGMAs once"""
+        # check_same_thread is off so that the pool can recycle connections of
+        # finished threads; a connection is still only used by its owner thread.
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout / 1000,
+                               detect_types=self.detect_types, check_same_thread=False)
+        conn.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout)}")
+        conn.execute(f"PRAGMA cache_size = {int(self.cache_size)}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        if self.trace_callback is not None:
+            conn.set_trace_callback(self.trace_callback)
+        return conn
+
+    def _reclaim_dead_owners(self):
+        """Move connections of finished threads back to the idle list (lock held)"""
+        for ident, (thread, conn) in list(self._owners.items()):
+            if thread.is_alive():
+                continue
+            del self._owners[ident]
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except sqlite3.Error:
+                conn.close()
+                continue
+            if len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+            else:
+                conn.close()
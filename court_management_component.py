@@ -1,16 +1,29 @@
 import streamlit as st
 import pandas as pd
 from datetime import date, datetime
+from functools import partial
 from database_operations import db_manager
+from export_pipeline import export_csv
+from fragments import rerun_section, section_fragment
+from reference_data import post_label, reference_data
 from typing import Dict, List, Optional
 
+# Employees shown per page in the Current Employees tab
+EMPLOYEES_PER_PAGE = 25
+
+# Summary columns shown in the Current Employees grid
+EMPLOYEE_GRID_COLUMNS = (
+    'employee_id', 'name', 'post_name', 'post_class', 'gender', 'date_of_joining', 'retirement_date',
+)
+
 class CourtManagementComponent:
     def __init__(self):
         self.court_id = None
         self.court_details = {}
-        self.employees = []
+        self.employee_count = 0
         self.posts = []
     
+    @section_fragment
     def render_court_details(self, court_id: int):
         """Render court information section"""
         self.court_id = court_id
@@ -63,7 +76,7 @@ class CourtManagementComponent:
                 with col2:
                     if st.form_submit_button("❌ Cancel"):
                         del st.session_state['editing_court_details']
-                        st.rerun()
+                        rerun_section()
         else:
             # Display mode - will be handled in the merged layout below
             pass
@@ -72,9 +85,10 @@ class CourtManagementComponent:
         self.posts = db_manager.get_court_posts_with_vacancies(self.court_id)
         
         if self.posts:
-            # Calculate totals from database queries
-            total_employees = db_manager.get_employee_count_by_court(self.court_id)
-            total_vacancies = sum(post['available_vacancies'] for post in self.posts)
+            # Totals come from the trigger-maintained court_stats rollup
+            court_stats = db_manager.get_court_stats(self.court_id)
+            total_employees = court_stats['headcount']
+            total_vacancies = court_stats['vacancies']
             
             # Display court details and totals in a merged layout
             st.markdown("---")
@@ -97,7 +111,7 @@ class CourtManagementComponent:
                 # Edit button for court details - smaller and simpler
                 if st.button("✏️ Edit", key="edit_court_details_btn", use_container_width=False):
                     st.session_state['editing_court_details'] = True
-                    st.rerun()
+                    rerun_section()
             
             with col2:
                 # Right side - Non-editable totals
@@ -120,13 +134,13 @@ class CourtManagementComponent:
                 </div>
                 """, unsafe_allow_html=True)
     
+    @section_fragment
     def render_post_management(self):
         """Render post management section"""
         st.subheader("👨‍💼 Post Management")
         
-        # Get posts with vacancy information (if not already loaded)
-        if not hasattr(self, 'posts') or not self.posts:
-            self.posts = db_manager.get_court_posts_with_vacancies(self.court_id)
+        # Get posts with vacancy information (reloaded so a fragment rerun sees fresh counts)
+        self.posts = db_manager.get_court_posts_with_vacancies(self.court_id)
         
         if not self.posts:
             st.warning("No posts found for this court.")
@@ -163,7 +177,7 @@ class CourtManagementComponent:
         # Single edit button that directly opens edit dialog
         if st.button("✏️ Edit Posts", key="edit_posts_button"):
             st.session_state.show_edit_posts = True
-            st.rerun()
+            rerun_section()
     
     def _render_edit_post_dialog(self):
         """Render edit post dialog for sanctioned vacancies"""
@@ -226,21 +240,22 @@ class CourtManagementComponent:
                 if cancel:
                     # Clear session state
                     del st.session_state['show_edit_posts']
-                    st.rerun()
+                    rerun_section()
     
+    @section_fragment
     def render_employee_management(self):
         """Render employee management section"""
-        # Get employees for this court
-        self.employees = db_manager.get_court_employees(self.court_id)
+        # Employees are listed a page at a time; only the count is needed up front
+        self.employee_count = db_manager.get_employee_count_by_court(self.court_id)
         
         # Show employee management header
         st.subheader("👥 Employee Management")
         
         # Employee management tabs
-        tab_names = ["👥 Current Employees", "➕ Add Employee"]
+        tab_names = ["👥 Current Employees", "➕ Add Employee", "📤 Bulk Upload"]
         
         # Create tabs
-        tab1, tab2 = st.tabs(tab_names)
+        tab1, tab2, tab3 = st.tabs(tab_names)
         
         with tab1:
             self._render_current_employees()
@@ -252,16 +267,16 @@ class CourtManagementComponent:
                 st.session_state.employee_added = False
             
             self._render_add_employee()
+        
+        with tab3:
+            self._render_bulk_upload()
     
     def _render_current_employees(self):
         """Render current employees list"""
-        if not self.employees:
+        if not self.employee_count:
             st.info("No employees found for this court.")
             return
         
-        # Create DataFrame for display
-        df_employees = pd.DataFrame(self.employees)
-        
         # Hybrid Search and Filter System
         
         # Check if clear button was pressed in previous run
@@ -277,440 +292,183 @@ class CourtManagementComponent:
         
         # Primary search box
         search_term = st.text_input("Search", key="employee_search_main", 
-                                   placeholder="Search by name, post, qualification, address, etc.",
+                                   placeholder="Search by name, father's name, post, qualification, address or branch",
                                    label_visibility="collapsed")
         
         # Quick filters row
         col1, col2, col3, col4 = st.columns([1, 1, 1, 0.5])
         with col1:
             post_filter = st.selectbox("👨‍💼 Post", 
-                                     options=["All"] + list(df_employees['post_name'].unique()),
+                                     options=["All"] + [p['post_name'] for p in reference_data.current().posts],
                                      key="post_filter")
         with col2:
             gender_filter = st.selectbox("👤 Gender", 
-                                       options=["All"] + list(df_employees['gender'].unique()),
+                                       options=["All", "Male", "Female", "Other"],
                                        key="gender_filter")
         with col3:
             caste_filter = st.selectbox("🏷️ Caste", 
-                                      options=["All"] + list(df_employees['caste'].unique()),
+                                      options=["All", "General", "OBC", "SC", "ST", "Other"],
                                       key="caste_filter")
         with col4:
             st.write("")  # Empty space for alignment
             if st.button("🗑️ Clear", key="clear_filters"):
                 # Set flag to clear filters in next run
                 st.session_state["clear_filters_clicked"] = True
-                st.rerun()
-        
-        # Apply all filters
-        filtered_df = df_employees.copy()
-        
-        # Primary search filter
-        if search_term:
-            search_mask = (
-                filtered_df['name'].str.contains(search_term, case=False, na=False) |
-                filtered_df['post_name'].str.contains(search_term, case=False, na=False) |
-                filtered_df['post_class'].str.contains(search_term, case=False, na=False) |
-                filtered_df['father_name'].str.contains(search_term, case=False, na=False) |
-                filtered_df['qualifications'].str.contains(search_term, case=False, na=False) |
-                filtered_df['caste'].str.contains(search_term, case=False, na=False) |
-                filtered_df['gender'].str.contains(search_term, case=False, na=False) |
-                filtered_df['branch'].str.contains(search_term, case=False, na=False) |
-                filtered_df['address'].str.contains(search_term, case=False, na=False) |
-                filtered_df['acr'].str.contains(search_term, case=False, na=False) |
-                filtered_df['salary'].astype(str).str.contains(search_term, case=False, na=False)
-            )
-            filtered_df = filtered_df[search_mask]
+                rerun_section()
         
-        # Quick filters
+        # Filters and search run in SQL; only the current page is fetched
+        filters = {}
         if post_filter != "All":
-            filtered_df = filtered_df[filtered_df['post_name'] == post_filter]
-        
+            filters['post_name'] = post_filter
         if gender_filter != "All":
-            filtered_df = filtered_df[filtered_df['gender'] == gender_filter]
-        
+            filters['gender'] = gender_filter
         if caste_filter != "All":
-            filtered_df = filtered_df[filtered_df['caste'] == caste_filter]
-        
-
-        
-        # Show results count
-        total_employees = len(df_employees)
-        filtered_count = len(filtered_df)
-        
-        if total_employees != filtered_count:
-            st.info(f"📊 Showing {filtered_count} of {total_employees} employees")
-        
-        # Use filtered dataframe
-        df_employees = filtered_df
-        
-        # Display employees with inline editing and transfer
-        for idx, employee in df_employees.iterrows():
-            employee_id = employee['employee_id']
-            is_editing = st.session_state.get('edit_employee_id') == employee_id
-            is_transferring = st.session_state.get('transfer_employee_id') == employee_id
-            
-            if is_editing:
-                # Inline edit mode
-                st.markdown(f"### ✏️ Employee ID {employee['employee_id']}")
-                
-                with st.form(f"inline_edit_form_{employee_id}"):
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        name = st.text_input("Full Name *", value=employee['name'], key=f"name_{employee_id}")
-                        date_of_birth = st.date_input("Date of Birth", value=employee['date_of_birth'], key=f"dob_{employee_id}")
-                        caste = st.selectbox("Caste", ["General", "OBC", "SC", "ST", "Other"], 
-                                           index=["General", "OBC", "SC", "ST", "Other"].index(employee['caste']), key=f"caste_{employee_id}")
-                        branch = st.text_input("Court", value=employee['branch'], key=f"branch_{employee_id}")
-                        date_of_joining = st.date_input("Date of Joining", value=employee['date_of_joining'], key=f"join_{employee_id}")
-                        
-                        # Retirement date input (editable)
-                        retirement_date = employee.get('retirement_date')
-                        # Handle retirement date display - it might be a string from database or NaT
-                        if retirement_date and retirement_date != pd.NaT:
-                            if isinstance(retirement_date, str):
-                                retirement_display = retirement_date
-                            else:
-                                try:
-                                    retirement_display = retirement_date.strftime('%Y-%m-%d')
-                                except (ValueError, AttributeError):
-                                    retirement_display = 'Invalid date'
-                        else:
-                            retirement_display = 'Not calculated'
-                        
-                        # Make retirement date editable
-                        retirement_input = st.date_input("Retirement Date", value=retirement_display if retirement_display != 'Not calculated' and retirement_display != 'Invalid date' else None, key=f"retirement_{employee_id}")
-                        
-                        address = st.text_area("Address", value=employee['address'], key=f"addr_{employee_id}")
-                    
-                    with col2:
-                        father_name = st.text_input("Father's Name", value=employee['father_name'], key=f"father_{employee_id}")
-                        gender = st.selectbox("Gender", ["Male", "Female", "Other"], 
-                                            index=["Male", "Female", "Other"].index(employee['gender']), key=f"gender_{employee_id}")
-                        
-                        # Post selection
-                        posts = db_manager.get_all_posts()
-                        post_options = {f"{p['post_name']} ({p['post_class']})": p['post_id'] for p in posts}
-                        current_post = f"{employee['post_name']} ({employee['post_class']})"
-                        selected_post = st.selectbox("Post *", options=list(post_options.keys()), 
-                                                   index=list(post_options.keys()).index(current_post), key=f"post_{employee_id}")
-                        post_id = post_options[selected_post]
-                        
-                        # Division field (auto-filled and non-editable)
-                        division_name = self.court_details.get('division_name', '')
-                        st.text_input("Division", value=division_name, key=f"division_{employee_id}", disabled=True)
-                        
-                        qualifications = st.text_area("Qualifications", value=employee['qualifications'], key=f"qual_{employee_id}")
-                        acr = st.selectbox("ACR Rating", ["Outstanding", "Excellent", "Very Good", "Good", "Average", "Poor"],
-                                         index=["Outstanding", "Excellent", "Very Good", "Good", "Average", "Poor"].index(employee['acr']), key=f"acr_{employee_id}")
-                        salary = st.number_input("Salary (₹)", min_value=0, value=int(employee['salary']), step=1000, key=f"salary_{employee_id}")
-                    
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        submitted = st.form_submit_button("💾 Save Changes")
-                    
-                    with col2:
-                        cancel = st.form_submit_button("❌ Cancel")
-                    
-                    if submitted:
-                        if not name or not post_id:
-                            st.error("Name and Post are required fields!")
-                        else:
-                            employee_data = {
-                                'name': name,
-                                'father_name': father_name,
-                                'date_of_birth': date_of_birth,
-                                'qualifications': qualifications,
-                                'caste': caste,
-                                'gender': gender,
-                                'branch': branch,
-                                'post_id': post_id,
-                                'date_of_joining': date_of_joining,
-                                'address': address,
-                                'acr': acr,
-                                'salary': salary,
-                                'retirement_date': retirement_input
-                            }
-                            
-                            if db_manager.update_employee(employee_id, employee_data):
-                                st.success("✅ Employee updated successfully!")
-                                # Clear session state
-                                del st.session_state['edit_employee_id']
-                                st.rerun()
-                            else:
-                                st.error("❌ Failed to update employee.")
-                    
-                    if cancel:
-                        # Clear session state
-                        del st.session_state['edit_employee_id']
-                        st.rerun()
-                
-                # Compute retirement date button (outside form)
-                col1, col2, col3 = st.columns([1, 1, 1])
-                with col2:
-                    if st.button("🔄 Auto-Calculate Retirement", key=f"compute_retirement_{employee_id}", help="Calculate retirement date based on date of birth"):
-                        # Get the current date of birth from the form
-                        current_dob = st.session_state.get(f"dob_{employee_id}", employee.get('date_of_birth'))
-                        if current_dob:
-                            new_retirement_date = db_manager.calculate_retirement_date(current_dob)
-                            if new_retirement_date:
-                                # Update the retirement date in session state to reflect in the form
-                                st.session_state[f"retirement_{employee_id}"] = new_retirement_date
-                                st.success("✅ Retirement date auto-calculated! Click 'Save Changes' to update.")
-                                st.rerun()
-                            else:
-                                st.error("❌ Could not calculate retirement date")
-                        else:
-                            st.error("❌ Please set date of birth first")
-                
-                st.markdown("---")
-            elif is_transferring:
-                # Inline transfer mode
-                st.markdown(f"### 🔄 Transferring: {employee['name']}")
-                
-                st.info(f"""
-                **Current Position:** {employee['post_name']} ({employee['post_class']})  
-                **Current Court:** {self.court_details['court_name']}
-                """)
-                
-                with st.form(f"inline_transfer_form_{employee_id}"):
-                    # Target court selection
-                    all_courts = db_manager.get_all_courts()
-                    court_options = {f"{court['court_name']} ({court['division_name']})": court['court_id'] for court in all_courts}
-                    target_court = st.selectbox("Target Court:", options=list(court_options.keys()), key=f"court_{employee_id}")
-                    target_court_id = court_options[target_court]
-                    
-                    # Target post selection
-                    posts = db_manager.get_all_posts()
-                    post_options = {f"{p['post_name']} ({p['post_class']})": p['post_id'] for p in posts}
-                    target_post = st.selectbox("Target Post:", options=list(post_options.keys()), key=f"post_transfer_{employee_id}")
-                    target_post_id = post_options[target_post]
-                    
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        submitted = st.form_submit_button("🔄 Transfer Employee")
-                    
-                    with col2:
-                        cancel = st.form_submit_button("❌ Cancel")
-                    
-                    if submitted:
-                        if db_manager.transfer_employee(employee_id, target_court_id, target_post_id):
-                            st.success("✅ Employee transferred successfully!")
-                            # Clear session state
-                            del st.session_state['transfer_employee_id']
-                            st.rerun()
-                        else:
-                            st.error("❌ Failed to transfer employee.")
-                    
-                    if cancel:
-                        # Clear session state
-                        del st.session_state['transfer_employee_id']
-                        st.rerun()
-                
-                st.markdown("---")
+            filters['caste'] = caste_filter
+        
+        filtered_count = db_manager.count_employees("court", self.court_id, filters=filters, search=search_term)
+        
+        if search_term and not filtered_count:
+            # Nothing matched as typed: offer names that are spelled alike
+            suggestions = db_manager.suggest_employees(search_term, scope="court", scope_id=self.court_id)
+            if suggestions:
+                st.info(f"🔎 No exact matches for '{search_term}'. Did you mean:")
+                suggestion_cols = st.columns(len(suggestions))
+                for col, suggestion in zip(suggestion_cols, suggestions):
+                    with col:
+                        st.button(suggestion['name'], key=f"suggest_{suggestion['employee_id']}",
+                                  on_click=self._use_search_suggestion, args=(suggestion['name'],))
             else:
-                # Normal display mode
-                with st.expander(f"👤 {employee['name']} - {employee['post_name']}"):
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.write(f"**Employee ID:** {employee['employee_id']}")
-                        st.write(f"**Father's Name:** {employee['father_name']}")
-                        st.write(f"**Date of Birth:** {employee['date_of_birth']}")
-                        st.write(f"**Gender:** {employee['gender']}")
-                        st.write(f"**Caste:** {employee['caste']}")
-                        st.write(f"**Qualifications:** {employee['qualifications']}")
-                    
-                    with col2:
-                        st.write(f"**Date of Joining:** {employee['date_of_joining']}")
-                        st.write(f"**Salary:** ₹{employee['salary']:,.2f}")
-                        # Handle retirement date display - it might be a string from database or NaT
-                        retirement_date = employee.get('retirement_date')
-                        if retirement_date and retirement_date != pd.NaT:
-                            if isinstance(retirement_date, str):
-                                retirement_display = retirement_date
-                            else:
-                                try:
-                                    retirement_display = retirement_date.strftime('%Y-%m-%d')
-                                except (ValueError, AttributeError):
-                                    retirement_display = 'Invalid date'
-                        else:
-                            retirement_display = 'Not calculated'
-                        st.write(f"**Retirement Date:** {retirement_display}")
-                        st.write(f"**ACR:** {employee['acr']}")
-                        st.write(f"**Address:** {employee['address']}")
-                    
-                    # Action buttons
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        if st.button("✏️ Edit", key=f"edit_{employee_id}"):
-                            st.session_state.edit_employee_id = employee_id
-                            st.rerun()
-                    
-                    with col2:
-                        if st.button("🔄 Transfer", key=f"transfer_{employee_id}"):
-                            st.session_state.transfer_employee_id = employee_id
-                            st.rerun()
-                    
-                    with col3:
-                        # Use session state to track termination confirmation
-                        terminate_key = f"terminate_{employee_id}"
-                        confirm_key = f"confirm_terminate_{employee_id}"
-                        
-                        if st.button("❌ Terminate", key=terminate_key):
-                            st.session_state[confirm_key] = True
-                            st.rerun()
-                        
-                        if st.session_state.get(confirm_key, False):
-                            # Simple checkbox and submit button
-                            confirm_terminate = st.checkbox(
-                                "Confirm termination", 
-                                key=f"confirm_checkbox_{employee_id}"
-                            )
-                            
-                            # Custom CSS to make only the submit button green when checked
-                            if confirm_terminate:
-                                st.markdown("""
-                                <style>
-                                div[data-testid="stButton"] button[kind="primary"] {
-                                    background-color: #28a745 !important;
-                                    color: white !important;
-                                    border-color: #28a745 !important;
-                                }
-                                </style>
-                                """, unsafe_allow_html=True)
-                            
-                            if st.button(
-                                "🗑️ Submit", 
-                                key=f"confirm_{employee_id}", 
-                                type="primary",
-                                disabled=not confirm_terminate
-                            ):
-                                if db_manager.terminate_employee(employee_id):
-                                    st.success("✅ Employee terminated successfully!")
-                                    # Clear session state
-                                    del st.session_state[confirm_key]
-                                    st.rerun()
-                                else:
-                                    st.error("❌ Failed to terminate employee.")
-        
-
-    
-
-    
-    def _render_transfer_dialog(self):
-        """Render transfer employee dialog"""
-        transfer_employee_id = st.session_state.get('transfer_employee_id')
-        
-        # Get employee details
-        employee = next((emp for emp in self.employees if emp['employee_id'] == transfer_employee_id), None)
+                st.info(f"🔎 No employees match '{search_term}'.")
+            return
         
-        if employee:
-            st.markdown("### 🔄 **Transfer Employee**")
-            st.markdown("---")
-            
-            st.info(f"""
-            **Transferring:** {employee['name']}  
-            **Current Position:** {employee['post_name']} ({employee['post_class']})  
-            **Current Court:** {self.court_details['court_name']}
-            """)
-            
-            with st.form("transfer_employee_form"):
-                    # Target court selection
-                    all_courts = db_manager.get_all_courts()
-                    court_options = {f"{court['court_name']} ({court['division_name']})": court['court_id'] for court in all_courts}
-                    target_court = st.selectbox("Target Court:", options=list(court_options.keys()))
-                    target_court_id = court_options[target_court]
-                    
-                    # Target post selection
-                    posts = db_manager.get_all_posts()
-                    post_options = {f"{p['post_name']} ({p['post_class']})": p['post_id'] for p in posts}
-                    target_post = st.selectbox("Target Post:", options=list(post_options.keys()))
-                    target_post_id = post_options[target_post]
-                    
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        submitted = st.form_submit_button("🔄 Transfer Employee")
-                    
-                    with col2:
-                        cancel = st.form_submit_button("❌ Cancel")
-                    
-                    with col3:
-                        if st.form_submit_button("🔄 Transfer & Edit Another"):
-                            submitted = True
-                            st.session_state.transfer_and_continue = True
-                    
-                    if submitted:
-                        if db_manager.transfer_employee(transfer_employee_id, target_court_id, target_post_id):
-                            st.success("✅ Employee transferred successfully!")
-                            # Clear session state
-                            del st.session_state['transfer_employee_id']
-                            if st.session_state.get('transfer_and_continue'):
-                                del st.session_state['transfer_and_continue']
-                            st.rerun()
-                        else:
-                            st.error("❌ Failed to transfer employee.")
-                    
-                    if cancel:
-                        # Clear session state
-                        del st.session_state['transfer_employee_id']
-                        st.rerun()
-    
-
+        # Keyset pagination: a stack of page start keys, reset whenever the query changes
+        page_state_key = f"employee_pages_{self.court_id}"
+        query_signature = (search_term, post_filter, gender_filter, caste_filter)
+        page_state = st.session_state.get(page_state_key)
+        if not page_state or page_state['query'] != query_signature:
+            page_state = {'query': query_signature, 'starts': [None]}
+            st.session_state[page_state_key] = page_state
+        
+        page = db_manager.list_employees("court", self.court_id, columns=EMPLOYEE_GRID_COLUMNS,
+                                         filters=filters, search=search_term,
+                                         after=page_state['starts'][-1], limit=EMPLOYEES_PER_PAGE)
+        
+        # Show results count and page navigation
+        page_number = len(page_state['starts'])
+        page_count = max(1, -(-filtered_count // EMPLOYEES_PER_PAGE))
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            if st.button("⬅️ Previous", key="employee_page_prev", disabled=page_number == 1):
+                page_state['starts'].pop()
+                rerun_section()
+        with col2:
+            if self.employee_count != filtered_count:
+                st.info(f"📊 Showing {filtered_count} of {self.employee_count} employees · page {page_number} of {page_count}")
+            else:
+                st.caption(f"📊 {filtered_count} employees · page {page_number} of {page_count}")
+        with col3:
+            if st.button("Next ➡️", key="employee_page_next", disabled=page['next_after'] is None):
+                page_state['starts'].append(page['next_after'])
+                rerun_section()
+        
+        # Compact grid of the current page; the detail panel loads for the selected row only
+        grid_rows = [{column: employee[column] for column in EMPLOYEE_GRID_COLUMNS} for employee in page['rows']]
+        grid_key = f"employee_grid_{page_number}_{st.session_state.get('employee_grid_version', 0)}"
+        grid = st.dataframe(
+            pd.DataFrame(grid_rows, columns=list(EMPLOYEE_GRID_COLUMNS)),
+            column_config={
+                'employee_id': st.column_config.NumberColumn("ID", format="%d"),
+                'name': "Name",
+                'post_name': "Post",
+                'post_class': "Class",
+                'gender': "Gender",
+                'date_of_joining': st.column_config.DateColumn("Joined"),
+                'retirement_date': st.column_config.DateColumn("Retires"),
+            },
+            hide_index=True,
+            use_container_width=True,
+            on_select="rerun",
+            selection_mode="single-row",
+            key=grid_key,
+        )
+        
+        selected_rows = [row for row in grid.selection.rows if row < len(grid_rows)]
+        if not selected_rows:
+            st.caption("👆 Select an employee to view details, edit, transfer or terminate.")
+            return
+        self._render_employee_panel(grid_rows[selected_rows[0]]['employee_id'])
     
-    def _render_edit_dialog(self):
-        """Render edit employee dialog"""
-        edit_employee_id = st.session_state.get('edit_employee_id')
+    def _render_employee_panel(self, employee_id: int):
+        """Render the detail, edit, transfer and terminate panel for one employee"""
+        employee = db_manager.get_employee(employee_id)
+        if not employee:
+            st.warning("This employee no longer exists.")
+            return
         
-        # Get employee details
-        employee = next((emp for emp in self.employees if emp['employee_id'] == edit_employee_id), None)
+        is_editing = st.session_state.get('edit_employee_id') == employee_id
+        is_transferring = st.session_state.get('transfer_employee_id') == employee_id
         
-        if employee:
-            st.markdown("### ✏️ **Edit Employee**")
-            st.markdown("---")
+        if is_editing:
+            # Inline edit mode
+            st.markdown(f"### ✏️ Employee ID {employee['employee_id']}")
             
-            st.info(f"**Editing:** {employee['name']} - {employee['post_name']}")
-            
-            with st.form("edit_employee_dialog_form"):
+            with st.form(f"inline_edit_form_{employee_id}"):
                 col1, col2 = st.columns(2)
-                
                 with col1:
-                    name = st.text_input("Full Name *", value=employee['name'])
-                    father_name = st.text_input("Father's Name", value=employee['father_name'])
-                    date_of_birth = st.date_input("Date of Birth", value=employee['date_of_birth'], min_value=date(1950, 1, 1), max_value=date.today())
-                    qualifications = st.text_area("Qualifications", value=employee['qualifications'])
+                    name = st.text_input("Full Name *", value=employee['name'], key=f"name_{employee_id}")
+                    date_of_birth = st.date_input("Date of Birth", value=employee['date_of_birth'], key=f"dob_{employee_id}")
                     caste = st.selectbox("Caste", ["General", "OBC", "SC", "ST", "Other"], 
-                                       index=["General", "OBC", "SC", "ST", "Other"].index(employee['caste']))
-                    gender = st.selectbox("Gender", ["Male", "Female", "Other"], 
-                                        index=["Male", "Female", "Other"].index(employee['gender']))
+                                       index=["General", "OBC", "SC", "ST", "Other"].index(employee['caste']), key=f"caste_{employee_id}")
+                    branch = st.text_input("Court", value=employee['branch'], key=f"branch_{employee_id}")
+                    date_of_joining = st.date_input("Date of Joining", value=employee['date_of_joining'], key=f"join_{employee_id}")
+                    
+                    # Retirement date input (editable)
+                    retirement_date = employee.get('retirement_date')
+                    # Handle retirement date display - it might be a string from database or NaT
+                    if retirement_date and retirement_date != pd.NaT:
+                        if isinstance(retirement_date, str):
+                            retirement_display = retirement_date
+                        else:
+                            try:
+                                retirement_display = retirement_date.strftime('%Y-%m-%d')
+                            except (ValueError, AttributeError):
+                                retirement_display = 'Invalid date'
+                    else:
+                        retirement_display = 'Not calculated'
+                    
+                    # Make retirement date editable
+                    retirement_input = st.date_input("Retirement Date", value=retirement_display if retirement_display != 'Not calculated' and retirement_display != 'Invalid date' else None, key=f"retirement_{employee_id}")
+                    
+                    address = st.text_area("Address", value=employee['address'], key=f"addr_{employee_id}")
                 
                 with col2:
-                    branch = st.text_input("Branch", value=employee['branch'])
-                    date_of_joining = st.date_input("Date of Joining", value=employee['date_of_joining'])
-                    address = st.text_area("Address", value=employee['address'])
-                    acr = st.selectbox("ACR Rating", ["Outstanding", "Excellent", "Very Good", "Good", "Average", "Poor"],
-                                     index=["Outstanding", "Excellent", "Very Good", "Good", "Average", "Poor"].index(employee['acr']))
-                    salary = st.number_input("Salary (₹)", min_value=0, value=int(employee['salary']), step=1000)
+                    father_name = st.text_input("Father's Name", value=employee['father_name'], key=f"father_{employee_id}")
+                    gender = st.selectbox("Gender", ["Male", "Female", "Other"], 
+                                        index=["Male", "Female", "Other"].index(employee['gender']), key=f"gender_{employee_id}")
                     
                     # Post selection
-                    posts = db_manager.get_all_posts()
-                    post_options = {f"{p['post_name']} ({p['post_class']})": p['post_id'] for p in posts}
-                    current_post = f"{employee['post_name']} ({employee['post_class']})"
-                    selected_post = st.selectbox("Post *", options=list(post_options.keys()), 
-                                               index=list(post_options.keys()).index(current_post))
-                    post_id = post_options[selected_post]
+                    posts_by_label = reference_data.current().posts_by_label
+                    current_post = post_label(employee)
+                    selected_post = st.selectbox("Post *", options=list(posts_by_label), 
+                                               index=list(posts_by_label).index(current_post), key=f"post_{employee_id}")
+                    post_id = posts_by_label[selected_post]['post_id']
+                    
+                    # Division field (auto-filled and non-editable)
+                    division_name = self.court_details.get('division_name', '')
+                    st.text_input("Division", value=division_name, key=f"division_{employee_id}", disabled=True)
+                    
+                    qualifications = st.text_area("Qualifications", value=employee['qualifications'], key=f"qual_{employee_id}")
+                    acr = st.selectbox("ACR Rating", ["Outstanding", "Excellent", "Very Good", "Good", "Average", "Poor"],
+                                     index=["Outstanding", "Excellent", "Very Good", "Good", "Average", "Poor"].index(employee['acr']), key=f"acr_{employee_id}")
+                    salary = st.number_input("Salary (₹)", min_value=0, value=int(employee['salary'] or 0), step=1000, key=f"salary_{employee_id}")
                 
-                col1, col2, col3 = st.columns(3)
+                col1, col2 = st.columns(2)
                 with col1:
-                    submitted = st.form_submit_button("💾 Update Employee")
+                    submitted = st.form_submit_button("💾 Save Changes")
                 
                 with col2:
                     cancel = st.form_submit_button("❌ Cancel")
                 
-                with col3:
-                    if st.form_submit_button("🔄 Update & Edit Another"):
-                        submitted = True
-                        st.session_state.edit_and_continue = True
-                
                 if submitted:
                     if not name or not post_id:
                         st.error("Name and Post are required fields!")
@@ -727,23 +485,179 @@ class CourtManagementComponent:
                             'date_of_joining': date_of_joining,
                             'address': address,
                             'acr': acr,
-                            'salary': salary
+                            'salary': salary,
+                            'retirement_date': retirement_input
                         }
                         
-                        if db_manager.update_employee(edit_employee_id, employee_data):
+                        if db_manager.update_employee(employee_id, employee_data):
                             st.success("✅ Employee updated successfully!")
                             # Clear session state
                             del st.session_state['edit_employee_id']
-                            if st.session_state.get('edit_and_continue'):
-                                del st.session_state['edit_and_continue']
                             st.rerun()
                         else:
                             st.error("❌ Failed to update employee.")
-                    
-                    if cancel:
-                        # Clear session state
-                        del st.session_state['edit_employee_id']
+                
+                if cancel:
+                    # Clear session state
+                    del st.session_state['edit_employee_id']
+                    rerun_section()
+            
+            # Compute retirement date button (outside form)
+            col1, col2, col3 = st.columns([1, 1, 1])
+            with col2:
+                if st.button("🔄 Auto-Calculate Retirement", key=f"compute_retirement_{employee_id}", help="Calculate retirement date based on date of birth"):
+                    # Get the current date of birth from the form
+                    current_dob = st.session_state.get(f"dob_{employee_id}", employee.get('date_of_birth'))
+                    if current_dob:
+                        new_retirement_date = db_manager.calculate_retirement_date(current_dob)
+                        if new_retirement_date:
+                            # Update the retirement date in session state to reflect in the form
+                            st.session_state[f"retirement_{employee_id}"] = new_retirement_date
+                            st.success("✅ Retirement date auto-calculated! Click 'Save Changes' to update.")
+                            rerun_section()
+                        else:
+                            st.error("❌ Could not calculate retirement date")
+                    else:
+                        st.error("❌ Please set date of birth first")
+            
+            st.markdown("---")
+        elif is_transferring:
+            # Inline transfer mode
+            st.markdown(f"### 🔄 Transferring: {employee['name']}")
+            
+            st.info(f"""
+            **Current Position:** {employee['post_name']} ({employee['post_class']})  
+            **Current Court:** {self.court_details['court_name']}
+            """)
+            
+            with st.form(f"inline_transfer_form_{employee_id}"):
+                # Target court selection
+                courts_by_label = reference_data.current().courts_by_label
+                target_court = st.selectbox("Target Court:", options=list(courts_by_label), key=f"court_{employee_id}")
+                target_court_id = courts_by_label[target_court]['court_id']
+                
+                # Target post selection
+                posts_by_label = reference_data.current().posts_by_label
+                target_post = st.selectbox("Target Post:", options=list(posts_by_label), key=f"post_transfer_{employee_id}")
+                target_post_id = posts_by_label[target_post]['post_id']
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    submitted = st.form_submit_button("🔄 Transfer Employee")
+                
+                with col2:
+                    cancel = st.form_submit_button("❌ Cancel")
+                
+                if submitted:
+                    if db_manager.transfer_employee(employee_id, target_court_id, target_post_id):
+                        st.success("✅ Employee transferred successfully!")
+                        # Clear session state and the grid selection (the row has left this court)
+                        del st.session_state['transfer_employee_id']
+                        st.session_state.employee_grid_version = st.session_state.get('employee_grid_version', 0) + 1
                         st.rerun()
+                    else:
+                        st.error("❌ Failed to transfer employee.")
+                
+                if cancel:
+                    # Clear session state
+                    del st.session_state['transfer_employee_id']
+                    rerun_section()
+            
+            st.markdown("---")
+        else:
+            # Normal display mode
+            with st.container(border=True):
+                st.markdown(f"#### 👤 {employee['name']} - {employee['post_name']}")
+                col1, col2 = st.columns(2)
+                
+                with col1:
+                    st.write(f"**Employee ID:** {employee['employee_id']}")
+                    st.write(f"**Father's Name:** {employee['father_name']}")
+                    st.write(f"**Date of Birth:** {employee['date_of_birth']}")
+                    st.write(f"**Gender:** {employee['gender']}")
+                    st.write(f"**Caste:** {employee['caste']}")
+                    st.write(f"**Qualifications:** {employee['qualifications']}")
+                
+                with col2:
+                    st.write(f"**Date of Joining:** {employee['date_of_joining']}")
+                    st.write(f"**Salary:** ₹{employee['salary'] or 0:,.2f}")
+                    # Handle retirement date display - it might be a string from database or NaT
+                    retirement_date = employee.get('retirement_date')
+                    if retirement_date and retirement_date != pd.NaT:
+                        if isinstance(retirement_date, str):
+                            retirement_display = retirement_date
+                        else:
+                            try:
+                                retirement_display = retirement_date.strftime('%Y-%m-%d')
+                            except (ValueError, AttributeError):
+                                retirement_display = 'Invalid date'
+                    else:
+                        retirement_display = 'Not calculated'
+                    st.write(f"**Retirement Date:** {retirement_display}")
+                    st.write(f"**ACR:** {employee['acr']}")
+                    st.write(f"**Address:** {employee['address']}")
+                
+                # Action buttons
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    if st.button("✏️ Edit", key=f"edit_{employee_id}"):
+                        st.session_state.edit_employee_id = employee_id
+                        rerun_section()
+                
+                with col2:
+                    if st.button("🔄 Transfer", key=f"transfer_{employee_id}"):
+                        st.session_state.transfer_employee_id = employee_id
+                        rerun_section()
+                
+                with col3:
+                    # Use session state to track termination confirmation
+                    terminate_key = f"terminate_{employee_id}"
+                    confirm_key = f"confirm_terminate_{employee_id}"
+                    
+                    if st.button("❌ Terminate", key=terminate_key):
+                        st.session_state[confirm_key] = True
+                        rerun_section()
+                    
+                    if st.session_state.get(confirm_key, False):
+                        # Simple checkbox and submit button
+                        confirm_terminate = st.checkbox(
+                            "Confirm termination", 
+                            key=f"confirm_checkbox_{employee_id}"
+                        )
+                        
+                        # Custom CSS to make only the submit button green when checked
+                        if confirm_terminate:
+                            st.markdown("""
+                            <style>
+                            div[data-testid="stButton"] button[kind="primary"] {
+                                background-color: #28a745 !important;
+                                color: white !important;
+                                border-color: #28a745 !important;
+                            }
+                            </style>
+                            """, unsafe_allow_html=True)
+                        
+                        if st.button(
+                            "🗑️ Submit", 
+                            key=f"confirm_{employee_id}", 
+                            type="primary",
+                            disabled=not confirm_terminate
+                        ):
+                            if db_manager.terminate_employee(employee_id):
+                                st.success("✅ Employee terminated successfully!")
+                                # Clear session state and the grid selection
+                                del st.session_state[confirm_key]
+                                st.session_state.employee_grid_version = st.session_state.get('employee_grid_version', 0) + 1
+                                st.rerun()
+                            else:
+                                st.error("❌ Failed to terminate employee.")
+
+    
+
+    
+    def _use_search_suggestion(self, name: str):
+        """Replace the search text with a "did you mean" suggestion (button callback)"""
+        st.session_state["employee_search_main"] = name
     
     def _render_add_employee(self):
         """Render add employee form"""
@@ -772,10 +686,9 @@ class CourtManagementComponent:
                 father_name = st.text_input("Father's Name")
                 gender = st.selectbox("Gender", ["Male", "Female", "Other"])
                 # Post selection
-                posts = db_manager.get_all_posts()
-                post_options = {f"{p['post_name']} ({p['post_class']})": p['post_id'] for p in posts}
-                selected_post = st.selectbox("Post *", options=list(post_options.keys()))
-                post_id = post_options[selected_post]
+                posts_by_label = reference_data.current().posts_by_label
+                selected_post = st.selectbox("Post *", options=list(posts_by_label))
+                post_id = posts_by_label[selected_post]['post_id']
                 # Auto-fill division name and make it non-editable
                 division_name = self.court_details.get('division_name', '')
                 st.text_input("Division", value=division_name, disabled=True)
@@ -815,67 +728,58 @@ class CourtManagementComponent:
     
 
     
+    def _render_bulk_upload(self):
+        """Render CSV upload for adding many employees to this court at once"""
+        st.write("**Upload Employees from CSV:**")
+        st.caption(
+            "Columns: name, post_name (or post_id), father_name, date_of_birth, date_of_joining "
+            "(YYYY-MM-DD), gender, caste, qualifications, address, acr, salary. "
+            "Rows without a court_id are added to this court."
+        )
+        
+        uploaded_file = st.file_uploader("Choose CSV file", type=['csv'], key="bulk_upload_file")
+        if uploaded_file is None:
+            return
+        
+        try:
+            df_upload = pd.read_csv(uploaded_file, dtype=str, keep_default_na=False)
+        except Exception as e:
+            st.error(f"❌ Could not read CSV file: {e}")
+            return
+        
+        df_upload.columns = [column.strip().lower() for column in df_upload.columns]
+        st.write(f"📋 {len(df_upload)} rows found. Preview:")
+        st.dataframe(df_upload.head(10), use_container_width=True, hide_index=True)
+        
+        if st.button(f"📥 Import {len(df_upload)} Employees", type="primary", key="bulk_upload_import"):
+            rows = df_upload.to_dict('records')
+            court_name = self.court_details.get('court_name', '')
+            for row in rows:
+                # Same default as the single add form
+                if not row.get('branch'):
+                    row['branch'] = court_name
+            
+            with st.spinner("Importing employees..."):
+                result = db_manager.bulk_add_employees(rows, court_id=self.court_id)
+            
+            if result['inserted']:
+                st.success(
+                    f"✅ Imported {result['inserted']} employees in {result['elapsed']:.2f}s "
+                    f"({result['rows_per_sec']:.0f} rows/sec)"
+                )
+            if result['errors']:
+                st.warning(f"⚠️ {result['failed']} rows were skipped:")
+                st.dataframe(pd.DataFrame(result['errors']), use_container_width=True, hide_index=True)
+    
+    @section_fragment
     def render_court_operations(self):
         """Render export employee list button"""
         st.subheader("📥 Export Employee List")
-        if self.employees:
-            df = pd.DataFrame(self.employees)
-            
-            # Add missing columns from court details
-            df['division_name'] = self.court_details.get('division_name', '')
-            df['court_number'] = self.court_details.get('court_number', '')
-            df['court_name'] = self.court_details.get('court_name', '')
-            df['officer_name'] = self.court_details.get('officer_name', '')
-            
-            # Add sanctioned vacancies and available vacancies from posts data
-            post_vacancies = {}
-            post_available_vacancies = {}
-            if hasattr(self, 'posts') and self.posts:
-                for post in self.posts:
-                    post_vacancies[post['post_name']] = post['sanctioned_vacancies']
-                    post_available_vacancies[post['post_name']] = post['available_vacancies']
-            
-            df['sanctioned_vacancies'] = df['post_name'].map(post_vacancies).fillna(0)
-            df['available_vacancies'] = df['post_name'].map(post_available_vacancies).fillna(0)
-            
-            # Reorder and rename columns for export
-            column_mapping = {
-                'employee_id': 'Employee ID',
-                'division_name': 'Division',
-                'court_number': 'Court Number', 
-                'court_name': 'Court Name',
-                'officer_name': 'Officer Name',
-                'post_name': 'Post',
-                'post_class': 'Class',
-                'sanctioned_vacancies': 'Sanctioned Vacancies',
-                'available_vacancies': 'Vacancies',
-                'name': 'Employee Name',
-                'gender': 'Gender',
-                'father_name': "Father's Name",
-                'date_of_birth': 'Date of Birth',
-                'qualifications': 'Qualification',
-                'retirement_date': 'Retirement Date'
-            }
-            
-            # Select and rename columns in the desired order
-            export_columns = [
-                'employee_id', 'division_name', 'court_number', 'court_name', 
-                'officer_name', 'post_name', 'post_class', 'sanctioned_vacancies',
-                'available_vacancies', 'name', 'gender', 'father_name', 'date_of_birth', 
-                'qualifications', 'retirement_date'
-            ]
-            
-            # Filter dataframe to only include available columns
-            available_columns = [col for col in export_columns if col in df.columns]
-            df_export = df[available_columns].copy()
-            
-            # Rename columns
-            df_export = df_export.rename(columns=column_mapping)
-            
-            csv = df_export.to_csv(index=False)
+        if db_manager.get_employee_count_by_court(self.court_id):
+            # The CSV is only built when the button is clicked
             st.download_button(
                 label="📥 Download CSV",
-                data=csv,
+                data=partial(export_csv, 'court', self.court_id),
                 file_name=f"employees_{self.court_details['court_name'].replace(' ', '_')}.csv",
                 mime="text/csv"
             )
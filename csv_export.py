@@ -0,0 +1,46 @@
+import csv
+import io
+from typing import Iterable, Iterator, Sequence, Tuple
+
+
+def iter_csv(header: Sequence[str], rows: Iterable[Sequence], rows_per_chunk: int = 1000,
+             encoding: str = "utf-8") -> Iterator[bytes]:
+    """Yield CSV-encoded bytes for a header and rows, one chunk of rows at a time"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(header)
+
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if count % rows_per_chunk == 0:
+            yield buffer.getvalue().encode(encoding)
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode(encoding)
+
+
+class _CountingRows:
+    """Wrap a row iterable and count the rows that pass through it"""
+
+    def __init__(self, rows: Iterable[Sequence]):
+        self.rows = rows
+        self.count = 0
+
+    def __iter__(self):
+        for row in self.rows:
+            self.count += 1
+            yield row
+
+
+def csv_bytes(header: Sequence[str], rows: Iterable[Sequence]) -> Tuple[bytes, int]:
+    """Encode rows as one CSV file in memory; returns (data, row count).
+
+    Rows are pulled from the iterable chunk by chunk, so no DataFrame or list
+    of rows is built, but the finished file is held in memory once because
+    st.download_button serves bytes.
+    """
+    counted = _CountingRows(rows)
+    data = b"".join(iter_csv(header, counted))
+    return data, counted.count
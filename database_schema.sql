@@ -72,80 +72,347 @@ CREATE TABLE IF NOT EXISTS post_courts (
     FOREIGN KEY (post_id) REFERENCES posts(post_id)
 );
 
+-- 6. COURT_STATS TABLE (per-court rollup, maintained by triggers below)
+CREATE TABLE IF NOT EXISTS court_stats (
+    court_id INTEGER PRIMARY KEY,
+    division_id INTEGER,
+    headcount INTEGER NOT NULL DEFAULT 0,
+    sanctioned INTEGER NOT NULL DEFAULT 0,
+    vacancies INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (court_id) REFERENCES courts(court_id),
+    FOREIGN KEY (division_id) REFERENCES divisions(division_id)
+);
+
+-- 7. DIVISION_STATS TABLE (per-division rollup of court_stats, maintained by triggers below)
+CREATE TABLE IF NOT EXISTS division_stats (
+    division_id INTEGER PRIMARY KEY,
+    headcount INTEGER NOT NULL DEFAULT 0,
+    sanctioned INTEGER NOT NULL DEFAULT 0,
+    vacancies INTEGER NOT NULL DEFAULT 0,
+    FOREIGN KEY (division_id) REFERENCES divisions(division_id)
+);
+
+-- 8. TRIGGER_CONTROL TABLE (single row; bulk_load = 1 suspends the per-row
+-- maintenance triggers below while DatabaseManager.bulk_load() is running)
+CREATE TABLE IF NOT EXISTS trigger_control (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    bulk_load INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO trigger_control (id, bulk_load) VALUES (1, 0);
+
+-- 9. EMPLOYEE_SEARCH (FTS5 full-text index over employee text fields and post
+-- name; rowid = employee_id, maintained by the search_* triggers below)
+CREATE VIRTUAL TABLE IF NOT EXISTS employee_search USING fts5(
+    name, father_name, qualifications, address, branch, post_name,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+
+-- 10. EMPLOYEE_NAME_TRIGRAMS (FTS5 trigram index over names for typo-tolerant
+-- "did you mean" lookups; rowid = employee_id, maintained by the trigram_*
+-- triggers below)
+CREATE VIRTUAL TABLE IF NOT EXISTS employee_name_trigrams USING fts5(
+    name, father_name,
+    tokenize = 'trigram'
+);
+
 -- Create indexes for better performance
-CREATE INDEX IF NOT EXISTS idx_employees_court_id ON employees(court_id);
+-- (court_id, post_id) also serves court_id-only lookups, so it replaces idx_employees_court_id
+DROP INDEX IF EXISTS idx_employees_court_id;
+CREATE INDEX IF NOT EXISTS idx_employees_court_post ON employees(court_id, post_id);
 CREATE INDEX IF NOT EXISTS idx_employees_post_id ON employees(post_id);
 CREATE INDEX IF NOT EXISTS idx_courts_division_id ON courts(parent_division_id);
 CREATE INDEX IF NOT EXISTS idx_divisions_parent_id ON divisions(parent_division_id);
 CREATE INDEX IF NOT EXISTS idx_post_courts_court_id ON post_courts(court_id);
 CREATE INDEX IF NOT EXISTS idx_post_courts_post_id ON post_courts(post_id);
 
--- Create trigger to update retirement date when date_of_birth is inserted/updated
-CREATE TRIGGER IF NOT EXISTS calculate_retirement_date_insert
+-- Every maintenance trigger below is dropped and recreated on each schema
+-- apply, so existing databases always run the current definitions, and is
+-- skipped while trigger_control.bulk_load is set.
+
+-- Fill in the retirement date (last day of the month the employee turns 58)
+-- when the application did not supply one, and recompute it when the date of
+-- birth actually changes.
+DROP TRIGGER IF EXISTS calculate_retirement_date_insert;
+CREATE TRIGGER calculate_retirement_date_insert
 AFTER INSERT ON employees
+WHEN (SELECT bulk_load FROM trigger_control) = 0 AND NEW.retirement_date IS NULL AND NEW.date_of_birth IS NOT NULL
 BEGIN
     UPDATE employees 
-    SET retirement_date = date(date_of_birth, '+58 years', 'last day of month')
+    SET retirement_date = date(NEW.date_of_birth, 'start of month', '+58 years', '+1 month', '-1 day')
     WHERE employee_id = NEW.employee_id;
 END;
 
-CREATE TRIGGER IF NOT EXISTS calculate_retirement_date_update
+DROP TRIGGER IF EXISTS calculate_retirement_date_update;
+CREATE TRIGGER calculate_retirement_date_update
 AFTER UPDATE OF date_of_birth ON employees
+WHEN (SELECT bulk_load FROM trigger_control) = 0 AND OLD.date_of_birth IS NOT NEW.date_of_birth
 BEGIN
     UPDATE employees 
-    SET retirement_date = date(NEW.date_of_birth, '+58 years', 'last day of month')
+    SET retirement_date = date(NEW.date_of_birth, 'start of month', '+58 years', '+1 month', '-1 day')
     WHERE employee_id = NEW.employee_id;
 END;
 
--- Create trigger to update active_employees_count in post_courts table
-CREATE TRIGGER IF NOT EXISTS update_active_employees_count_insert
+-- Backfill rows written while the old triggers left retirement_date empty
+UPDATE employees
+SET retirement_date = date(date_of_birth, 'start of month', '+58 years', '+1 month', '-1 day')
+WHERE retirement_date IS NULL AND date_of_birth IS NOT NULL;
+
+-- Keep active_employees_count in post_courts current with +1/-1 deltas.
+-- The earlier update_active_employees_count_* triggers recounted the whole
+-- court/post pair on every write; drop them from databases that still have them.
+DROP TRIGGER IF EXISTS update_active_employees_count_insert;
+DROP TRIGGER IF EXISTS update_active_employees_count_update;
+DROP TRIGGER IF EXISTS update_active_employees_count_delete;
+
+DROP TRIGGER IF EXISTS post_count_employee_insert;
+CREATE TRIGGER post_count_employee_insert
 AFTER INSERT ON employees
+WHEN (SELECT bulk_load FROM trigger_control) = 0
 BEGIN
-    UPDATE post_courts 
-    SET active_employees_count = (
-        SELECT COUNT(*) 
-        FROM employees 
-        WHERE employees.court_id = NEW.court_id 
-        AND employees.post_id = NEW.post_id
-    )
+    UPDATE post_courts
+    SET active_employees_count = active_employees_count + 1
     WHERE court_id = NEW.court_id AND post_id = NEW.post_id;
 END;
 
-CREATE TRIGGER IF NOT EXISTS update_active_employees_count_update
+DROP TRIGGER IF EXISTS post_count_employee_move;
+CREATE TRIGGER post_count_employee_move
 AFTER UPDATE OF court_id, post_id ON employees
+WHEN (SELECT bulk_load FROM trigger_control) = 0 AND (OLD.court_id IS NOT NEW.court_id OR OLD.post_id IS NOT NEW.post_id)
 BEGIN
-    -- Update count for old court-post combination
-    UPDATE post_courts 
-    SET active_employees_count = (
-        SELECT COUNT(*) 
-        FROM employees 
-        WHERE employees.court_id = OLD.court_id 
-        AND employees.post_id = OLD.post_id
-    )
+    UPDATE post_courts
+    SET active_employees_count = active_employees_count - 1
     WHERE court_id = OLD.court_id AND post_id = OLD.post_id;
     
-    -- Update count for new court-post combination
-    UPDATE post_courts 
+    UPDATE post_courts
+    SET active_employees_count = active_employees_count + 1
+    WHERE court_id = NEW.court_id AND post_id = NEW.post_id;
+END;
+
+DROP TRIGGER IF EXISTS post_count_employee_delete;
+CREATE TRIGGER post_count_employee_delete
+AFTER DELETE ON employees
+WHEN (SELECT bulk_load FROM trigger_control) = 0
+BEGIN
+    UPDATE post_courts
+    SET active_employees_count = active_employees_count - 1
+    WHERE court_id = OLD.court_id AND post_id = OLD.post_id;
+END;
+
+-- A post allocated to a court after employees already hold it starts from
+-- their current count (an index seek on idx_employees_court_post)
+DROP TRIGGER IF EXISTS post_count_post_court_insert;
+CREATE TRIGGER post_count_post_court_insert
+AFTER INSERT ON post_courts
+WHEN (SELECT bulk_load FROM trigger_control) = 0 AND EXISTS (SELECT 1 FROM employees WHERE court_id = NEW.court_id AND post_id = NEW.post_id)
+BEGIN
+    UPDATE post_courts
     SET active_employees_count = (
-        SELECT COUNT(*) 
-        FROM employees 
-        WHERE employees.court_id = NEW.court_id 
+        SELECT COUNT(*)
+        FROM employees
+        WHERE employees.court_id = NEW.court_id
         AND employees.post_id = NEW.post_id
     )
     WHERE court_id = NEW.court_id AND post_id = NEW.post_id;
 END;
 
-CREATE TRIGGER IF NOT EXISTS update_active_employees_count_delete
+-- Keep court_stats / division_stats current incrementally.
+-- Every trigger applies a delta, so a write costs O(1) regardless of headcount;
+-- DatabaseManager.rebuild_stats() recomputes both tables from scratch.
+DROP TRIGGER IF EXISTS stats_division_insert;
+CREATE TRIGGER stats_division_insert
+AFTER INSERT ON divisions
+WHEN (SELECT bulk_load FROM trigger_control) = 0
+BEGIN
+    INSERT OR IGNORE INTO division_stats (division_id) VALUES (NEW.division_id);
+END;
+
+DROP TRIGGER IF EXISTS stats_court_insert;
+CREATE TRIGGER stats_court_insert
+AFTER INSERT ON courts
+WHEN (SELECT bulk_load FROM trigger_control) = 0
+BEGIN
+    INSERT OR IGNORE INTO division_stats (division_id) VALUES (NEW.parent_division_id);
+    INSERT OR IGNORE INTO court_stats (court_id, division_id) VALUES (NEW.court_id, NEW.parent_division_id);
+END;
+
+DROP TRIGGER IF EXISTS stats_court_move;
+CREATE TRIGGER stats_court_move
+AFTER UPDATE OF parent_division_id ON courts
+WHEN (SELECT bulk_load FROM trigger_control) = 0 AND OLD.parent_division_id IS NOT NEW.parent_division_id
+BEGIN
+    UPDATE division_stats SET
+        headcount = headcount - (SELECT headcount FROM court_stats WHERE court_id = OLD.court_id),
+        sanctioned = sanctioned - (SELECT sanctioned FROM court_stats WHERE court_id = OLD.court_id),
+        vacancies = vacancies - (SELECT vacancies FROM court_stats WHERE court_id = OLD.court_id)
+    WHERE division_id = OLD.parent_division_id;
+    INSERT OR IGNORE INTO division_stats (division_id) VALUES (NEW.parent_division_id);
+    UPDATE division_stats SET
+        headcount = headcount + (SELECT headcount FROM court_stats WHERE court_id = NEW.court_id),
+        sanctioned = sanctioned + (SELECT sanctioned FROM court_stats WHERE court_id = NEW.court_id),
+        vacancies = vacancies + (SELECT vacancies FROM court_stats WHERE court_id = NEW.court_id)
+    WHERE division_id = NEW.parent_division_id;
+    UPDATE court_stats SET division_id = NEW.parent_division_id WHERE court_id = NEW.court_id;
+END;
+
+DROP TRIGGER IF EXISTS stats_court_delete;
+CREATE TRIGGER stats_court_delete
+AFTER DELETE ON courts
+WHEN (SELECT bulk_load FROM trigger_control) = 0
+BEGIN
+    UPDATE division_stats SET
+        headcount = headcount - (SELECT headcount FROM court_stats WHERE court_id = OLD.court_id),
+        sanctioned = sanctioned - (SELECT sanctioned FROM court_stats WHERE court_id = OLD.court_id),
+        vacancies = vacancies - (SELECT vacancies FROM court_stats WHERE court_id = OLD.court_id)
+    WHERE division_id = OLD.parent_division_id;
+    DELETE FROM court_stats WHERE court_id = OLD.court_id;
+END;
+
+DROP TRIGGER IF EXISTS stats_employee_insert;
+CREATE TRIGGER stats_employee_insert
+AFTER INSERT ON employees
+WHEN (SELECT bulk_load FROM trigger_control) = 0
+BEGIN
+    UPDATE court_stats SET headcount = headcount + 1 WHERE court_id = NEW.court_id;
+    UPDATE division_stats SET headcount = headcount + 1
+    WHERE division_id = (SELECT division_id FROM court_stats WHERE court_id = NEW.court_id);
+END;
+
+DROP TRIGGER IF EXISTS stats_employee_move;
+CREATE TRIGGER stats_employee_move
+AFTER UPDATE OF court_id ON employees
+WHEN (SELECT bulk_load FROM trigger_control) = 0 AND OLD.court_id IS NOT NEW.court_id
+BEGIN
+    UPDATE court_stats SET headcount = headcount - 1 WHERE court_id = OLD.court_id;
+    UPDATE division_stats SET headcount = headcount - 1
+    WHERE division_id = (SELECT division_id FROM court_stats WHERE court_id = OLD.court_id);
+    UPDATE court_stats SET headcount = headcount + 1 WHERE court_id = NEW.court_id;
+    UPDATE division_stats SET headcount = headcount + 1
+    WHERE division_id = (SELECT division_id FROM court_stats WHERE court_id = NEW.court_id);
+END;
+
+DROP TRIGGER IF EXISTS stats_employee_delete;
+CREATE TRIGGER stats_employee_delete
 AFTER DELETE ON employees
+WHEN (SELECT bulk_load FROM trigger_control) = 0
 BEGIN
-    UPDATE post_courts 
-    SET active_employees_count = (
-        SELECT COUNT(*) 
-        FROM employees 
-        WHERE employees.court_id = OLD.court_id 
-        AND employees.post_id = OLD.post_id
-    )
-    WHERE court_id = OLD.court_id AND post_id = OLD.post_id;
+    UPDATE court_stats SET headcount = headcount - 1 WHERE court_id = OLD.court_id;
+    UPDATE division_stats SET headcount = headcount - 1
+    WHERE division_id = (SELECT division_id FROM court_stats WHERE court_id = OLD.court_id);
+END;
+
+DROP TRIGGER IF EXISTS stats_post_court_insert;
+CREATE TRIGGER stats_post_court_insert
+AFTER INSERT ON post_courts
+WHEN (SELECT bulk_load FROM trigger_control) = 0
+BEGIN
+    UPDATE court_stats SET
+        sanctioned = sanctioned + NEW.sanctioned_vacancies,
+        vacancies = vacancies + (NEW.sanctioned_vacancies - NEW.active_employees_count)
+    WHERE court_id = NEW.court_id;
+    UPDATE division_stats SET
+        sanctioned = sanctioned + NEW.sanctioned_vacancies,
+        vacancies = vacancies + (NEW.sanctioned_vacancies - NEW.active_employees_count)
+    WHERE division_id = (SELECT division_id FROM court_stats WHERE court_id = NEW.court_id);
+END;
+
+DROP TRIGGER IF EXISTS stats_post_court_update;
+CREATE TRIGGER stats_post_court_update
+AFTER UPDATE OF sanctioned_vacancies, active_employees_count ON post_courts
+WHEN (SELECT bulk_load FROM trigger_control) = 0
+BEGIN
+    UPDATE court_stats SET
+        sanctioned = sanctioned + (NEW.sanctioned_vacancies - OLD.sanctioned_vacancies),
+        vacancies = vacancies + (NEW.sanctioned_vacancies - NEW.active_employees_count)
+                              - (OLD.sanctioned_vacancies - OLD.active_employees_count)
+    WHERE court_id = NEW.court_id;
+    UPDATE division_stats SET
+        sanctioned = sanctioned + (NEW.sanctioned_vacancies - OLD.sanctioned_vacancies),
+        vacancies = vacancies + (NEW.sanctioned_vacancies - NEW.active_employees_count)
+                              - (OLD.sanctioned_vacancies - OLD.active_employees_count)
+    WHERE division_id = (SELECT division_id FROM court_stats WHERE court_id = NEW.court_id);
+END;
+
+DROP TRIGGER IF EXISTS stats_post_court_delete;
+CREATE TRIGGER stats_post_court_delete
+AFTER DELETE ON post_courts
+WHEN (SELECT bulk_load FROM trigger_control) = 0
+BEGIN
+    UPDATE court_stats SET
+        sanctioned = sanctioned - OLD.sanctioned_vacancies,
+        vacancies = vacancies - (OLD.sanctioned_vacancies - OLD.active_employees_count)
+    WHERE court_id = OLD.court_id;
+    UPDATE division_stats SET
+        sanctioned = sanctioned - OLD.sanctioned_vacancies,
+        vacancies = vacancies - (OLD.sanctioned_vacancies - OLD.active_employees_count)
+    WHERE division_id = (SELECT division_id FROM court_stats WHERE court_id = OLD.court_id);
+END;
+
+-- Keep employee_search in step with employees and post names
+DROP TRIGGER IF EXISTS search_employee_insert;
+CREATE TRIGGER search_employee_insert
+AFTER INSERT ON employees
+WHEN (SELECT bulk_load FROM trigger_control) = 0
+BEGIN
+    INSERT INTO employee_search (rowid, name, father_name, qualifications, address, branch, post_name)
+    VALUES (NEW.employee_id, NEW.name, NEW.father_name, NEW.qualifications, NEW.address, NEW.branch,
+            (SELECT post_name FROM posts WHERE post_id = NEW.post_id));
+END;
+
+DROP TRIGGER IF EXISTS search_employee_update;
+CREATE TRIGGER search_employee_update
+AFTER UPDATE OF name, father_name, qualifications, address, branch, post_id ON employees
+WHEN (SELECT bulk_load FROM trigger_control) = 0
+BEGIN
+    DELETE FROM employee_search WHERE rowid = OLD.employee_id;
+    INSERT INTO employee_search (rowid, name, father_name, qualifications, address, branch, post_name)
+    VALUES (NEW.employee_id, NEW.name, NEW.father_name, NEW.qualifications, NEW.address, NEW.branch,
+            (SELECT post_name FROM posts WHERE post_id = NEW.post_id));
+END;
+
+DROP TRIGGER IF EXISTS search_employee_delete;
+CREATE TRIGGER search_employee_delete
+AFTER DELETE ON employees
+WHEN (SELECT bulk_load FROM trigger_control) = 0
+BEGIN
+    DELETE FROM employee_search WHERE rowid = OLD.employee_id;
+END;
+
+DROP TRIGGER IF EXISTS search_post_rename;
+CREATE TRIGGER search_post_rename
+AFTER UPDATE OF post_name ON posts
+WHEN (SELECT bulk_load FROM trigger_control) = 0 AND OLD.post_name IS NOT NEW.post_name
+BEGIN
+    UPDATE employee_search SET post_name = NEW.post_name
+    WHERE rowid IN (SELECT employee_id FROM employees WHERE post_id = NEW.post_id);
+END;
+
+-- Keep employee_name_trigrams in step with employee names
+DROP TRIGGER IF EXISTS trigram_employee_insert;
+CREATE TRIGGER trigram_employee_insert
+AFTER INSERT ON employees
+WHEN (SELECT bulk_load FROM trigger_control) = 0
+BEGIN
+    INSERT INTO employee_name_trigrams (rowid, name, father_name)
+    VALUES (NEW.employee_id, NEW.name, NEW.father_name);
+END;
+
+DROP TRIGGER IF EXISTS trigram_employee_update;
+CREATE TRIGGER trigram_employee_update
+AFTER UPDATE OF name, father_name ON employees
+WHEN (SELECT bulk_load FROM trigger_control) = 0
+BEGIN
+    DELETE FROM employee_name_trigrams WHERE rowid = OLD.employee_id;
+    INSERT INTO employee_name_trigrams (rowid, name, father_name)
+    VALUES (NEW.employee_id, NEW.name, NEW.father_name);
+END;
+
+DROP TRIGGER IF EXISTS trigram_employee_delete;
+CREATE TRIGGER trigram_employee_delete
+AFTER DELETE ON employees
+WHEN (SELECT bulk_load FROM trigger_control) = 0
+BEGIN
+    DELETE FROM employee_name_trigrams WHERE rowid = OLD.employee_id;
 END;
 
 -- Insert default division (Jind Sessions Court)
@@ -161,8 +428,11 @@ INSERT OR IGNORE INTO posts (post_name, post_class) VALUES
 ('Driver', 'Class IV'),
 ('Security Guard', 'Class IV');
 
--- Create view for employee details with related information
-CREATE VIEW IF NOT EXISTS employee_details AS
+-- Create view for employee details with related information, including the
+-- sanctioned/available figures of the post at the employee's court (used by
+-- export_pipeline). Recreated on every schema apply to pick up new columns.
+DROP VIEW IF EXISTS employee_details;
+CREATE VIEW employee_details AS
 SELECT 
     e.employee_id,
     e.name,
@@ -182,11 +452,19 @@ SELECT
     c.court_name,
     c.court_number,
     c.location,
-    d.division_name
+    d.division_name,
+    e.post_id,
+    e.court_id,
+    d.division_id,
+    c.officer_name,
+    COALESCE(pc.sanctioned_vacancies, 0) AS sanctioned_vacancies,
+    COALESCE(pc.active_employees_count, 0) AS active_employees_count,
+    COALESCE(pc.sanctioned_vacancies - pc.active_employees_count, 0) AS available_vacancies
 FROM employees e
 LEFT JOIN posts p ON e.post_id = p.post_id
 LEFT JOIN courts c ON e.court_id = c.court_id
-LEFT JOIN divisions d ON c.parent_division_id = d.division_id;
+LEFT JOIN divisions d ON c.parent_division_id = d.division_id
+LEFT JOIN post_courts pc ON pc.court_id = e.court_id AND pc.post_id = e.post_id;
 
 -- Create view for vacancy analysis
 CREATE VIEW IF NOT EXISTS vacancy_analysis AS
@@ -1,7 +1,12 @@
 import streamlit as st
 import pandas as pd
 from datetime import date, datetime
+from functools import partial
 from database_operations import db_manager
+from export_pipeline import export_csv
+from fragments import section_fragment
+from reference_data import reference_data
+from parallel_loader import format_timings, load_panels
 from typing import Dict, List, Optional
 
 class DivisionManagementComponent:
@@ -9,6 +14,7 @@ class DivisionManagementComponent:
         self.division_id = None
         self.division_details = {}
         self.courts = []
+        self.court_rollup = []
         self.employees = []
     
     def render_division_details(self, division_id: int):
@@ -21,13 +27,21 @@ class DivisionManagementComponent:
             return
         
         # Get courts for this division
-        self.courts = db_manager.get_courts_by_division(division_id)
+        self.courts = reference_data.current().courts_in_division(division_id)
         
         if self.courts:
+            # Division totals and the court breakdown load side by side
+            panels, timings = load_panels({
+                'division_stats': partial(db_manager.get_division_stats, division_id),
+                'court_rollup': partial(db_manager.get_court_rollup, division_id),
+            })
+            self.court_rollup = panels['court_rollup'] or []
+            
             # Calculate division statistics
             total_courts = len(self.courts)
-            total_employees = db_manager.get_employee_count_by_division(division_id)
-            total_vacancies = db_manager.get_vacancy_count_by_division(division_id)
+            division_stats = panels['division_stats'] or {'headcount': 0, 'vacancies': 0}
+            total_employees = division_stats['headcount']
+            total_vacancies = division_stats['vacancies']
             
             # Display division header
             st.markdown(f"""
@@ -64,6 +78,8 @@ class DivisionManagementComponent:
             # Division Actions
             st.subheader("📥 Division Actions")
             self._render_division_actions()
+            
+            st.caption(f"⏱️ {format_timings(timings)}")
     
     def _render_court_breakdown(self):
         """Render court-wise breakdown with employee count and vacancies"""
@@ -71,102 +87,31 @@ class DivisionManagementComponent:
             st.info("No courts found in this division.")
             return
         
-        # Create table data for court breakdown
+        # Create table data for court breakdown from one grouped rollup query
         court_data = []
-        for court in self.courts:
-            court_id = court['court_id']
-            employee_count = db_manager.get_employee_count_by_court(court_id)
-            vacancy_count = db_manager.get_vacancy_count_by_court(court_id)
-            
+        for court in self.court_rollup:
             court_data.append({
                 'Court Name': court['court_name'],
                 'Court Number': court['court_number'] or 'N/A',
                 'Officer Name': court['officer_name'] or 'Not Assigned',
-                'Employees': employee_count,
-                'Vacancies': vacancy_count
+                'Employees': court['employees'],
+                'Sanctioned Posts': court['sanctioned_posts'],
+                'Vacancies': court['vacancies']
             })
         
         # Create DataFrame and display
         df_courts = pd.DataFrame(court_data)
         st.dataframe(df_courts, use_container_width=True, hide_index=True)
     
+    @section_fragment
     def _render_division_actions(self):
         """Render division action buttons"""
         if self.courts:
-            # Get all employees in the division
-            self.employees = db_manager.get_division_employees(self.division_id)
-            
-            if self.employees:
-                df = pd.DataFrame(self.employees)
-                
-                # Add missing columns from court details
-                df['division_name'] = self.division_details.get('division_name', '')
-                
-                # Add court information for each employee
-                court_info = {}
-                for court in self.courts:
-                    court_info[court['court_id']] = {
-                        'court_number': court['court_number'],
-                        'court_name': court['court_name'],
-                        'officer_name': court['officer_name']
-                    }
-                
-                df['court_number'] = df['court_id'].map(lambda x: court_info.get(x, {}).get('court_number', ''))
-                df['court_name'] = df['court_id'].map(lambda x: court_info.get(x, {}).get('court_name', ''))
-                df['officer_name'] = df['court_id'].map(lambda x: court_info.get(x, {}).get('officer_name', ''))
-                
-                # Add sanctioned vacancies and available vacancies from posts data
-                post_vacancies = {}
-                post_available_vacancies = {}
-                for court in self.courts:
-                    court_posts = db_manager.get_court_posts_with_vacancies(court['court_id'])
-                    for post in court_posts:
-                        key = f"{post['post_name']}_{court['court_id']}"
-                        post_vacancies[key] = post['sanctioned_vacancies']
-                        post_available_vacancies[key] = post['available_vacancies']
-                
-                df['post_court_key'] = df['post_name'] + '_' + df['court_id'].astype(str)
-                df['sanctioned_vacancies'] = df['post_court_key'].map(post_vacancies).fillna(0)
-                df['available_vacancies'] = df['post_court_key'].map(post_available_vacancies).fillna(0)
-                
-                # Reorder and rename columns for export
-                column_mapping = {
-                    'employee_id': 'Employee ID',
-                    'division_name': 'Division',
-                    'court_number': 'Court Number', 
-                    'court_name': 'Court Name',
-                    'officer_name': 'Officer Name',
-                    'post_name': 'Post',
-                    'post_class': 'Class',
-                    'sanctioned_vacancies': 'Sanctioned Vacancies',
-                    'available_vacancies': 'Vacancies',
-                    'name': 'Employee Name',
-                    'gender': 'Gender',
-                    'father_name': "Father's Name",
-                    'date_of_birth': 'Date of Birth',
-                    'qualifications': 'Qualification',
-                    'retirement_date': 'Retirement Date'
-                }
-                
-                # Select and rename columns in the desired order
-                export_columns = [
-                    'employee_id', 'division_name', 'court_number', 'court_name', 
-                    'officer_name', 'post_name', 'post_class', 'sanctioned_vacancies',
-                    'available_vacancies', 'name', 'gender', 'father_name', 'date_of_birth', 
-                    'qualifications', 'retirement_date'
-                ]
-                
-                # Filter dataframe to only include available columns
-                available_columns = [col for col in export_columns if col in df.columns]
-                df_export = df[available_columns].copy()
-                
-                # Rename columns
-                df_export = df_export.rename(columns=column_mapping)
-                
-                csv = df_export.to_csv(index=False)
+            # The CSV is only built when the button is clicked
+            if db_manager.count_employees('division', self.division_id):
                 st.download_button(
                     label="📥 Download CSV",
-                    data=csv,
+                    data=partial(export_csv, 'division', self.division_id),
                     file_name=f"division_{self.division_details['division_name'].replace(' ', '_')}.csv",
                     mime="text/csv"
                 )
@@ -0,0 +1,64 @@
+from typing import Iterator, List, Optional, Tuple
+from database_operations import db_manager
+from csv_export import csv_bytes
+
+# (employee_details column, CSV header) in export order
+EXPORT_COLUMNS = [
+    ('employee_id', 'Employee ID'),
+    ('division_name', 'Division'),
+    ('court_number', 'Court Number'),
+    ('court_name', 'Court Name'),
+    ('officer_name', 'Officer Name'),
+    ('post_name', 'Post'),
+    ('post_class', 'Class'),
+    ('sanctioned_vacancies', 'Sanctioned Vacancies'),
+    ('available_vacancies', 'Vacancies'),
+    ('name', 'Employee Name'),
+    ('gender', 'Gender'),
+    ('father_name', "Father's Name"),
+    ('date_of_birth', 'Date of Birth'),
+    ('qualifications', 'Qualification'),
+    ('retirement_date', 'Retirement Date'),
+]
+
+# scope -> (filter on employee_details, sort order)
+EXPORT_SCOPES = {
+    'court': ("court_id = ?", "post_class, name"),
+    'division': ("division_id = ?", "court_name, post_class, name"),
+    'system': (None, "name"),
+}
+
+
+def export_query(scope: str) -> str:
+    """Build the single employee_details query behind an export scope"""
+    if scope not in EXPORT_SCOPES:
+        raise ValueError(f"Unknown export scope: {scope}")
+    where, order_by = EXPORT_SCOPES[scope]
+
+    select_list = ",\n       ".join(f'{column} AS "{header}"' for column, header in EXPORT_COLUMNS)
+    query = f"SELECT {select_list}\nFROM employee_details"
+    if where:
+        query += f"\nWHERE {where}"
+    return query + f"\nORDER BY {order_by}"
+
+
+def iter_export_rows(scope: str, scope_id: Optional[int] = None) -> Tuple[List[str], Iterator[tuple]]:
+    """Stream the export rows of a court, a division or the whole system"""
+    query = export_query(scope)
+    params = () if EXPORT_SCOPES[scope][0] is None else (scope_id,)
+    try:
+        return db_manager.iter_query(query, params)
+    except Exception as e:
+        print(f"Error exporting {scope} employees: {e}")
+        return [header for _, header in EXPORT_COLUMNS], iter(())
+
+
+def build_export(scope: str, scope_id: Optional[int] = None) -> Tuple[bytes, int]:
+    """CSV export of a scope; returns (data, row count)"""
+    columns, rows = iter_export_rows(scope, scope_id)
+    return csv_bytes(columns, rows)
+
+
+def export_csv(scope: str, scope_id: Optional[int] = None) -> bytes:
+    """CSV export of a scope, for st.download_button(data=...) to build only when clicked"""
+    return build_export(scope, scope_id)[0]
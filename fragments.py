@@ -0,0 +1,32 @@
+from functools import wraps
+
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+
+from query_cache import request_scope
+
+
+def section_fragment(render):
+    """st.fragment whose reruns get their own request scope.
+
+    During a full run the section joins the page's scope; when the fragment
+    reruns on its own, its reads are still de-duplicated within that rerun.
+    """
+    @wraps(render)
+    def scoped(*args, **kwargs):
+        with request_scope():
+            return render(*args, **kwargs)
+    return st.fragment(scoped)
+
+
+def rerun_section():
+    """Rerun only the enclosing st.fragment after a UI-only state change.
+
+    Streamlit folds a fragment's widget events into a full-app rerun when one
+    is already pending, and scope="fragment" is rejected there; fall back to a
+    normal rerun in that case.
+    """
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
@@ -5,32 +5,238 @@ from court_management_component import CourtManagementComponent
 from division_management_component import DivisionManagementComponent
 from system_management_component import SystemManagementComponent
 from database_operations import db_manager
+from query_cache import request_scope
 from auth_component import AuthComponent
 
 def init_database_if_needed():
-    """Initialize database if it doesn't exist"""
-    db_path = "court_management.db"
-    if not os.path.exists(db_path):
-        try:
-            # Read the schema file
-            with open('database_schema.sql', 'r') as file:
-                schema_sql = file.read()
-            
-            # Create database connection
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            
-            # Execute the schema
-            cursor.executescript(schema_sql)
-            
-            # Commit the changes
-            conn.commit()
-            conn.close()
-            
-            print("✅ Database initialized successfully!")
-            
-        except Exception as e:
-            print(f"❌ Error initializing database: {e}")
+    """Create the database, or bring an existing one up to the current schema"""
+    if not os.path.exists(db_manager.db_path):
+        print("🔄 Creating new database...")
+    
+    # Idempotent; runs once per process and backfills any newly added rollup tables
+    if db_manager.ensure_schema():
+        print("✅ Database schema is up to date")
+    else:
+        print("❌ Error initializing database")
+
+# Custom CSS injected once per full rerun; fragment reruns keep the page's existing styles
+APP_CSS = """
+<style>
+.main-header {
+    font-size: 2.5rem;
+    font-weight: bold;
+    color: #1f77b4;
+    text-align: center;
+    margin-bottom: 2rem;
+}
+.info-box {
+    background-color: #f0f2f6;
+    padding: 1rem;
+    border-radius: 0.5rem;
+    border-left: 4px solid #1f77b4;
+}
+
+/* Remove red borders from input fields */
+.stTextInput > div > div > input,
+.stSelectbox > div > div > select,
+.stDateInput > div > div > input,
+.stNumberInput > div > div > input,
+.stTextArea > div > div > textarea {
+    border: none !important;
+    border-radius: 4px !important;
+    background-color: #262730 !important;
+}
+
+.stTextInput > div > div > input:focus,
+.stSelectbox > div > div > select:focus,
+.stDateInput > div > div > input:focus,
+.stNumberInput > div > div > input:focus,
+.stTextArea > div > div > textarea:focus {
+    border: none !important;
+    box-shadow: none !important;
+    outline: none !important;
+    background-color: #262730 !important;
+}
+
+/* Remove red borders from Streamlit widgets */
+.stTextInput > div,
+.stSelectbox > div,
+.stDateInput > div,
+.stNumberInput > div,
+.stTextArea > div {
+    border: none !important;
+    box-shadow: none !important;
+}
+
+/* Remove borders from sidebar selectboxes specifically */
+.css-1d391kg .stSelectbox > div > div > div {
+    border: none !important;
+    box-shadow: none !important;
+}
+
+/* Remove all borders from form fields */
+.stForm .stTextInput > div > div > input,
+.stForm .stSelectbox > div > div > select,
+.stForm .stDateInput > div > div > input,
+.stForm .stNumberInput > div > div > input,
+.stForm .stTextArea > div > div > textarea {
+    border: none !important;
+    background-color: #262730 !important;
+}
+
+/* Remove focus borders from all elements */
+*:focus {
+    outline: none !important;
+    border: none !important;
+    box-shadow: none !important;
+}
+
+/* Remove red borders from dropdown selection states */
+.stSelectbox > div > div > div[data-baseweb="select"] {
+    border: none !important;
+    box-shadow: none !important;
+}
+
+.stSelectbox > div > div > div[data-baseweb="select"]:focus {
+    border: none !important;
+    box-shadow: none !important;
+    outline: none !important;
+}
+
+/* Remove red borders from dropdown options */
+.stSelectbox > div > div > div[data-baseweb="select"] > div {
+    border: none !important;
+    box-shadow: none !important;
+}
+
+/* Remove red borders from dropdown when open */
+.stSelectbox > div > div > div[data-baseweb="select"][aria-expanded="true"] {
+    border: none !important;
+    box-shadow: none !important;
+}
+
+/* Remove red borders from all select elements */
+select:focus,
+select:active,
+select:hover {
+    border: none !important;
+    outline: none !important;
+    box-shadow: none !important;
+}
+
+/* Remove red borders from dropdown containers */
+.stSelectbox > div > div > div[data-baseweb="select"] > div[role="listbox"] {
+    border: none !important;
+    box-shadow: none !important;
+}
+
+/* Remove red borders from dropdown option items */
+.stSelectbox > div > div > div[data-baseweb="select"] > div[role="listbox"] > div {
+    border: none !important;
+    box-shadow: none !important;
+}
+
+/* Remove red borders from dropdown when selecting */
+.stSelectbox > div > div > div[data-baseweb="select"][aria-expanded="true"] > div {
+    border: none !important;
+    box-shadow: none !important;
+}
+
+/* Aggressive removal of all red borders from dropdowns */
+.stSelectbox * {
+    border-color: transparent !important;
+    border: none !important;
+    box-shadow: none !important;
+    outline: none !important;
+}
+
+/* Remove red borders from all dropdown states */
+.stSelectbox > div,
+.stSelectbox > div > div,
+.stSelectbox > div > div > div,
+.stSelectbox > div > div > div > div,
+.stSelectbox > div > div > div > div > div {
+    border: none !important;
+    border-color: transparent !important;
+    box-shadow: none !important;
+    outline: none !important;
+}
+
+/* Remove red borders from dropdown input */
+.stSelectbox input,
+.stSelectbox select {
+    border: none !important;
+    border-color: transparent !important;
+    box-shadow: none !important;
+    outline: none !important;
+}
+
+/* Remove red borders from dropdown when focused */
+.stSelectbox:focus,
+.stSelectbox:focus-within,
+.stSelectbox:focus-visible {
+    border: none !important;
+    border-color: transparent !important;
+    box-shadow: none !important;
+    outline: none !important;
+}
+
+/* Remove red borders from all form elements */
+.stForm *,
+.stForm *:focus,
+.stForm *:active,
+.stForm *:hover {
+    border: none !important;
+    border-color: transparent !important;
+    box-shadow: none !important;
+    outline: none !important;
+}
+
+/* Remove red borders from sidebar specifically */
+.css-1d391kg *,
+.css-1d391kg *:focus,
+.css-1d391kg *:active,
+.css-1d391kg *:hover {
+    border: none !important;
+    border-color: transparent !important;
+    box-shadow: none !important;
+    outline: none !important;
+}
+
+/* Add white line to separate current selection from dropdown options */
+.stSelectbox > div > div > div[data-baseweb="select"] {
+    border-bottom: 2px solid white !important;
+    border-radius: 4px 4px 0 0 !important;
+}
+
+/* Style the dropdown options container */
+.stSelectbox > div > div > div[data-baseweb="select"] > div[role="listbox"] {
+    border-top: 2px solid white !important;
+    border-radius: 0 0 4px 4px !important;
+    margin-top: -2px !important;
+}
+
+/* Add subtle white border to dropdown when open */
+.stSelectbox > div > div > div[data-baseweb="select"][aria-expanded="true"] {
+    border: 2px solid rgba(255, 255, 255, 0.3) !important;
+    border-radius: 4px !important;
+}
+
+/* Style individual dropdown options */
+.stSelectbox > div > div > div[data-baseweb="select"] > div[role="listbox"] > div {
+    border-bottom: 2px solid rgba(255, 255, 255, 0.1) !important;
+}
+
+/* Remove bottom border from last option */
+.stSelectbox > div > div > div[data-baseweb="select"] > div[role="listbox"] > div:last-child {
+    border-bottom: none !important;
+}
+</style>
+"""
+
+def inject_styles():
+    """Inject the app-wide custom CSS"""
+    st.markdown(APP_CSS, unsafe_allow_html=True)
 
 def main():
     # Initialize database if needed
@@ -68,219 +274,7 @@ def main():
         return
     
     # Custom CSS for better styling
-    st.markdown("""
-    <style>
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: bold;
-        color: #1f77b4;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .info-box {
-        background-color: #f0f2f6;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #1f77b4;
-    }
-    
-    /* Remove red borders from input fields */
-    .stTextInput > div > div > input,
-    .stSelectbox > div > div > select,
-    .stDateInput > div > div > input,
-    .stNumberInput > div > div > input,
-    .stTextArea > div > div > textarea {
-        border: none !important;
-        border-radius: 4px !important;
-        background-color: #262730 !important;
-    }
-    
-    .stTextInput > div > div > input:focus,
-    .stSelectbox > div > div > select:focus,
-    .stDateInput > div > div > input:focus,
-    .stNumberInput > div > div > input:focus,
-    .stTextArea > div > div > textarea:focus {
-        border: none !important;
-        box-shadow: none !important;
-        outline: none !important;
-        background-color: #262730 !important;
-    }
-    
-    /* Remove red borders from Streamlit widgets */
-    .stTextInput > div,
-    .stSelectbox > div,
-    .stDateInput > div,
-    .stNumberInput > div,
-    .stTextArea > div {
-        border: none !important;
-        box-shadow: none !important;
-    }
-    
-    /* Remove borders from sidebar selectboxes specifically */
-    .css-1d391kg .stSelectbox > div > div > div {
-        border: none !important;
-        box-shadow: none !important;
-    }
-    
-    /* Remove all borders from form fields */
-    .stForm .stTextInput > div > div > input,
-    .stForm .stSelectbox > div > div > select,
-    .stForm .stDateInput > div > div > input,
-    .stForm .stNumberInput > div > div > input,
-    .stForm .stTextArea > div > div > textarea {
-        border: none !important;
-        background-color: #262730 !important;
-    }
-    
-    /* Remove focus borders from all elements */
-    *:focus {
-        outline: none !important;
-        border: none !important;
-        box-shadow: none !important;
-    }
-    
-    /* Remove red borders from dropdown selection states */
-    .stSelectbox > div > div > div[data-baseweb="select"] {
-        border: none !important;
-        box-shadow: none !important;
-    }
-    
-    .stSelectbox > div > div > div[data-baseweb="select"]:focus {
-        border: none !important;
-        box-shadow: none !important;
-        outline: none !important;
-    }
-    
-    /* Remove red borders from dropdown options */
-    .stSelectbox > div > div > div[data-baseweb="select"] > div {
-        border: none !important;
-        box-shadow: none !important;
-    }
-    
-    /* Remove red borders from dropdown when open */
-    .stSelectbox > div > div > div[data-baseweb="select"][aria-expanded="true"] {
-        border: none !important;
-        box-shadow: none !important;
-    }
-    
-    /* Remove red borders from all select elements */
-    select:focus,
-    select:active,
-    select:hover {
-        border: none !important;
-        outline: none !important;
-        box-shadow: none !important;
-    }
-    
-    /* Remove red borders from dropdown containers */
-    .stSelectbox > div > div > div[data-baseweb="select"] > div[role="listbox"] {
-        border: none !important;
-        box-shadow: none !important;
-    }
-    
-    /* Remove red borders from dropdown option items */
-    .stSelectbox > div > div > div[data-baseweb="select"] > div[role="listbox"] > div {
-        border: none !important;
-        box-shadow: none !important;
-    }
-    
-    /* Remove red borders from dropdown when selecting */
-    .stSelectbox > div > div > div[data-baseweb="select"][aria-expanded="true"] > div {
-        border: none !important;
-        box-shadow: none !important;
-    }
-    
-    /* Aggressive removal of all red borders from dropdowns */
-    .stSelectbox * {
-        border-color: transparent !important;
-        border: none !important;
-        box-shadow: none !important;
-        outline: none !important;
-    }
-    
-    /* Remove red borders from all dropdown states */
-    .stSelectbox > div,
-    .stSelectbox > div > div,
-    .stSelectbox > div > div > div,
-    .stSelectbox > div > div > div > div,
-    .stSelectbox > div > div > div > div > div {
-        border: none !important;
-        border-color: transparent !important;
-        box-shadow: none !important;
-        outline: none !important;
-    }
-    
-    /* Remove red borders from dropdown input */
-    .stSelectbox input,
-    .stSelectbox select {
-        border: none !important;
-        border-color: transparent !important;
-        box-shadow: none !important;
-        outline: none !important;
-    }
-    
-    /* Remove red borders from dropdown when focused */
-    .stSelectbox:focus,
-    .stSelectbox:focus-within,
-    .stSelectbox:focus-visible {
-        border: none !important;
-        border-color: transparent !important;
-        box-shadow: none !important;
-        outline: none !important;
-    }
-    
-    /* Remove red borders from all form elements */
-    .stForm *,
-    .stForm *:focus,
-    .stForm *:active,
-    .stForm *:hover {
-        border: none !important;
-        border-color: transparent !important;
-        box-shadow: none !important;
-        outline: none !important;
-    }
-    
-    /* Remove red borders from sidebar specifically */
-    .css-1d391kg *,
-    .css-1d391kg *:focus,
-    .css-1d391kg *:active,
-    .css-1d391kg *:hover {
-        border: none !important;
-        border-color: transparent !important;
-        box-shadow: none !important;
-        outline: none !important;
-    }
-    
-    /* Add white line to separate current selection from dropdown options */
-    .stSelectbox > div > div > div[data-baseweb="select"] {
-        border-bottom: 2px solid white !important;
-        border-radius: 4px 4px 0 0 !important;
-    }
-    
-    /* Style the dropdown options container */
-    .stSelectbox > div > div > div[data-baseweb="select"] > div[role="listbox"] {
-        border-top: 2px solid white !important;
-        border-radius: 0 0 4px 4px !important;
-        margin-top: -2px !important;
-    }
-    
-    /* Add subtle white border to dropdown when open */
-    .stSelectbox > div > div > div[data-baseweb="select"][aria-expanded="true"] {
-        border: 2px solid rgba(255, 255, 255, 0.3) !important;
-        border-radius: 4px !important;
-    }
-    
-    /* Style individual dropdown options */
-    .stSelectbox > div > div > div[data-baseweb="select"] > div[role="listbox"] > div {
-        border-bottom: 2px solid rgba(255, 255, 255, 0.1) !important;
-    }
-    
-    /* Remove bottom border from last option */
-    .stSelectbox > div > div > div[data-baseweb="select"] > div[role="listbox"] > div:last-child {
-        border-bottom: none !important;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    inject_styles()
     
     # Initialize sidebar component
     sidebar = SidebarComponent()
@@ -315,7 +309,7 @@ def main():
             header_text = f"⚖️ {court_details['court_name']} ({court_details['division_name']})"
             st.markdown(f'<h1 class="main-header">{header_text}</h1>', unsafe_allow_html=True)
         
-        # Render court management sections
+        # Render court management sections; each is a fragment, so its widgets rerun only that section
         court_manager.render_court_details(selected_court_id)
         st.markdown("---")
         
@@ -346,4 +340,6 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    # One request scope per script run collapses repeated reads across components
+    with request_scope():
+        main()
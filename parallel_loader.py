@@ -0,0 +1,53 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+from query_metrics import caller_context
+
+# Upper bound on panel reads running at once across all sessions; each worker
+# thread reads through its own pooled connection, so this also caps the
+# connections the loader holds.
+PANEL_WORKERS = 4
+
+_executor = ThreadPoolExecutor(max_workers=PANEL_WORKERS, thread_name_prefix="panel-loader")
+
+
+def _timed(loader: Callable[[], object]) -> Tuple[object, float]:
+    start = time.perf_counter()
+    value = loader()
+    return value, time.perf_counter() - start
+
+
+def load_panels(loaders: Mapping[Hashable, Callable[[], object]],
+                timeout: Optional[float] = None) -> Tuple[Dict[Hashable, object], Dict[Hashable, float]]:
+    """Run independent panel reads concurrently and wait for all of them.
+
+    Returns (results, timings): each panel's value and its own wall time in
+    seconds, plus the overall wall time under the 'total' key of timings. A
+    loader that raises (or is still running at the timeout) yields None.
+    """
+    start = time.perf_counter()
+    # Each loader gets its own context so query metrics credit this page, not the pool thread
+    futures = {name: _executor.submit(caller_context().run, _timed, loader) for name, loader in loaders.items()}
+    deadline = None if timeout is None else start + timeout
+
+    results: Dict[Hashable, object] = {}
+    timings: Dict[Hashable, float] = {}
+    for name, future in futures.items():
+        remaining = None if deadline is None else max(0.0, deadline - time.perf_counter())
+        try:
+            results[name], timings[name] = future.result(timeout=remaining)
+        except Exception as e:
+            print(f"Error loading panel {name}: {e}")
+            results[name] = None
+            timings[name] = time.perf_counter() - start
+    timings['total'] = time.perf_counter() - start
+    return results, timings
+
+
+def format_timings(timings: Mapping[Hashable, float]) -> str:
+    """One-line summary of load_panels timings, slowest panel first"""
+    panels = sorted(((name, seconds) for name, seconds in timings.items() if name != 'total'),
+                    key=lambda item: item[1], reverse=True)
+    details = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in panels)
+    return f"Loaded {len(panels)} panels in {timings.get('total', 0.0) * 1000:.0f} ms ({details})"
@@ -0,0 +1,297 @@
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+# Set by DatabaseManager._report_error so a read that failed (and returned its
+# empty default) is not stored as if it were real data.
+_call_state = threading.local()
+
+
+def note_failure():
+    """Mark the current thread's in-flight read as failed"""
+    _call_state.failed = True
+
+
+def reset_failure():
+    """Start tracking read failures afresh on the current thread"""
+    _call_state.failed = False
+
+
+def read_failed() -> bool:
+    """Whether a read on this thread failed since the last reset_failure()"""
+    return getattr(_call_state, "failed", False)
+
+
+def _copy_result(value):
+    """Copy list/dict results so callers cannot mutate cached entries"""
+    if isinstance(value, list):
+        return [dict(item) if isinstance(item, dict) else item for item in value]
+    if isinstance(value, dict):
+        return {name: _copy_result(item) if isinstance(item, list) else item for name, item in value.items()}
+    return value
+
+
+def _freeze(value):
+    """Make dict/list/set arguments hashable so they can be part of a cache key"""
+    if isinstance(value, dict):
+        return tuple(sorted((name, _freeze(item)) for name, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    return value
+
+
+class RequestScope:
+    """Memo of @cached results for one script run (one Streamlit rerun).
+
+    Identical reads within the scope are answered from the memo without
+    touching the shared cache; writes drop the memo entries for the tables
+    they touch, and the whole memo is discarded when the scope ends, so it
+    needs no cross-rerun invalidation.
+    """
+
+    def __init__(self):
+        self._values: Dict[Hashable, Tuple[Tuple[str, ...], object]] = {}
+        self.calls = 0
+        self.duplicates = Counter()
+
+    def lookup(self, key: Hashable):
+        """(True, value) for a memoized read, counting the duplicate; else (False, None)"""
+        self.calls += 1
+        entry = self._values.get(key)
+        if entry is None:
+            return False, None
+        self.duplicates[key[0]] += 1
+        return True, _copy_result(entry[1])
+
+    def store(self, key: Hashable, tables: Tuple[str, ...], value):
+        """Memoize a read result tagged with the tables it depends on"""
+        self._values[key] = (tables, value)
+
+    def drop(self, tables: Optional[Iterable[str]] = None):
+        """Forget memoized reads of tables (all of them when tables is None)"""
+        if tables is None:
+            self._values.clear()
+            return
+        tables = set(tables)
+        for key, (entry_tables, _) in list(self._values.items()):
+            if tables.intersection(entry_tables):
+                del self._values[key]
+
+    def stats(self) -> Dict:
+        """Reads seen, duplicates collapsed and the methods they came from"""
+        return {
+            'calls': self.calls,
+            'duplicates': sum(self.duplicates.values()),
+            'duplicates_by_method': dict(self.duplicates),
+        }
+
+
+_scope_state = threading.local()
+_last_scope_stats: Dict = {}
+
+
+def current_scope() -> Optional[RequestScope]:
+    """The request scope active on this thread, if any"""
+    return getattr(_scope_state, 'scope', None)
+
+
+@contextmanager
+def request_scope():
+    """Collapse identical @cached reads for the duration of one script run.
+
+    Nested uses join the scope that is already active on the thread.
+    """
+    scope = current_scope()
+    if scope is not None:
+        yield scope
+        return
+
+    global _last_scope_stats
+    scope = _scope_state.scope = RequestScope()
+    try:
+        yield scope
+    finally:
+        _scope_state.scope = None
+        _last_scope_stats = scope.stats()
+
+
+def last_scope_stats() -> Dict:
+    """Stats of the most recently finished request scope"""
+    return dict(_last_scope_stats)
+
+
+class QueryCache:
+    """LRU cache of DatabaseManager read results, invalidated per table.
+
+    Entries are keyed by method name and arguments and tagged with the tables
+    the query reads. Every write bumps the generation of the tables it touches;
+    an entry is only served while the generations it was stored under are
+    still current, so a write evicts exactly the entries that depend on it.
+
+    Writes made elsewhere (another DatabaseManager, another process) never
+    reach invalidate(), so when data_version is given it is polled (at most
+    once per poll_interval seconds) and the whole cache is retired whenever
+    it changes. Commits of our own report their change via own_commit(), so
+    they only evict the tables they touched.
+    """
+
+    def __init__(self, max_entries: int = 512, data_version: Optional[Callable[[], Optional[int]]] = None,
+                 poll_interval: float = 0.5):
+        self.max_entries = max_entries
+        self.data_version = data_version
+        self.poll_interval = poll_interval
+        self._seen_version = None
+        self._next_poll = 0.0
+        self._entries: "OrderedDict[Hashable, Tuple[Tuple[str, ...], Tuple[int, ...], object]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0  # advanced by clear() to retire every entry at once
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _current(self, tables: Tuple[str, ...]) -> Tuple[int, ...]:
+        return (self._epoch,) + tuple(self._generations.get(table, 0) for table in tables)
+
+    def _check_data_version(self):
+        """Clear everything if the database changed since the last lookup"""
+        if self.data_version is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_poll:
+                return
+            self._next_poll = now + self.poll_interval
+        version = self.data_version()
+        if version is None:
+            return
+        with self._lock:
+            changed = self._seen_version is not None and version != self._seen_version
+            self._seen_version = version
+        if changed:
+            self.clear()
+
+    def own_commit(self, before: Optional[int], after: Optional[int]):
+        """Accept the data_version change of a commit of our own (before: version once the write lock was held)"""
+        if before is None or after is None:
+            return
+        with self._lock:
+            # Anything committed elsewhere before the write lock was taken is
+            # still unseen here, and the next poll clears the cache for it
+            if self._seen_version in (None, before):
+                self._seen_version = after
+
+    def read_through(self, key: Hashable, tables: Tuple[str, ...], loader: Callable):
+        """Return the cached value for key, calling loader() on a miss"""
+        self._check_data_version()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == self._current(entry[0]):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _copy_result(entry[2])
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            generations = self._current(tables)
+
+        _call_state.failed = False
+        value = loader()
+        if _call_state.failed:
+            return value
+
+        with self._lock:
+            # Skip the store if a write landed while the query was running
+            if generations == self._current(tables):
+                self._entries[key] = (tables, generations, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return _copy_result(value)
+
+    def generation(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        """Opaque version of tables; changes whenever a write touches any of them"""
+        self._check_data_version()
+        with self._lock:
+            return self._current(tuple(tables))
+
+    def invalidate(self, tables: Iterable[str]):
+        """Bump the generation of each table and drop entries that read it"""
+        tables = set(tables)
+        scope = current_scope()
+        if scope is not None:
+            scope.drop(tables)
+        with self._lock:
+            for table in tables:
+                self._generations[table] = self._generations.get(table, 0) + 1
+            for key, (entry_tables, _, _) in list(self._entries.items()):
+                if tables.intersection(entry_tables):
+                    del self._entries[key]
+                    self.invalidations += 1
+
+    def clear(self):
+        """Drop every entry, e.g. after the whole database was replaced"""
+        scope = current_scope()
+        if scope is not None:
+            scope.drop()
+        with self._lock:
+            self._epoch += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+
+def cached(*tables: str):
+    """Serve a DatabaseManager getter through self.cache, tagged with tables"""
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = (method.__name__, _freeze(args), _freeze(kwargs))
+            scope = current_scope()
+            if scope is None:
+                return self.cache.read_through(key, tables, lambda: method(self, *args, **kwargs))
+
+            scope_key = key + (id(self.cache),)
+            found, value = scope.lookup(scope_key)
+            if found:
+                return value
+            _call_state.failed = False
+            value = self.cache.read_through(key, tables, lambda: method(self, *args, **kwargs))
+            if not _call_state.failed:
+                scope.store(scope_key, tables, _copy_result(value))
+            return value
+        return wrapper
+    return decorator
+
+
+def invalidates(*tables: str):
+    """Evict cache entries for tables after a DatabaseManager write runs"""
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self.cache.invalidate(tables)
+        return wrapper
+    return decorator
@@ -0,0 +1,321 @@
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import Context, ContextVar, copy_context
+from functools import wraps
+from typing import Dict, List, Optional
+
+# Upper bounds (ms) of the wall-time histogram buckets; the last bucket is open
+HISTOGRAM_BOUNDS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+# Calls slower than this are written to the slow-query log
+DEFAULT_SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "250"))
+DEFAULT_SLOW_QUERY_LOG = os.getenv("SLOW_QUERY_LOG", "slow_queries.log")
+
+# Distinct fingerprints kept per call; further ones are only counted
+MAX_FINGERPRINTS = 32
+
+# Statements that are bookkeeping rather than queries of their own
+_CONTROL_STATEMENT = re.compile(r"^\s*(BEGIN|COMMIT|END|ROLLBACK|SAVEPOINT|RELEASE|PRAGMA)\b", re.IGNORECASE)
+_PRAGMA_STATEMENT = re.compile(r"^\s*PRAGMA\b", re.IGNORECASE)
+# Statements SQLite runs on its own behalf: nested ones are reported as "-- ..."
+# comments, and virtual tables (FTS5) name their shadow tables as 'schema'.'table'
+_INTERNAL_STATEMENT = re.compile(r"^\s*--|'\w+'\.'")
+# Where the first bound value starts in expanded SQL; the text before it is
+# the same for every execution of one prepared statement
+_FIRST_VALUE = re.compile(r"'|(?<![\w.])-?\d")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# Modules whose frames are skipped when looking for the component behind a call
+_INFRASTRUCTURE_MODULES = {"database_operations", "query_cache", "query_metrics", "write_queue",
+                           "parallel_loader", "async_database", "fragments", "reference_data"}
+_REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# The DatabaseManager call in progress in this context; write jobs run on the
+# writer thread inside the submitting caller's context, so their statements
+# are attributed to the method that queued them.
+_current_call: ContextVar[Optional["QueryRecord"]] = ContextVar("current_query_call", default=None)
+# Component that handed work to a pool thread, where its frames are not on the stack
+_handed_off_by: ContextVar[Optional[str]] = ContextVar("query_component", default=None)
+
+
+def fingerprint(sql: str) -> str:
+    """SQL with literals replaced by ? and whitespace collapsed"""
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("(?...)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def _calling_component() -> str:
+    """Module name of the first app frame outside the database layer"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        path = frame.f_code.co_filename
+        module = os.path.splitext(os.path.basename(path))[0]
+        # Pseudo-files such as <string> or <frozen runpy> have no directory of their own
+        if (not path.startswith("<") and os.path.dirname(os.path.abspath(path)) == _REPO_DIR
+                and module not in _INFRASTRUCTURE_MODULES):
+            return module
+        frame = frame.f_back
+    return _handed_off_by.get() or threading.current_thread().name
+
+
+def caller_context() -> Context:
+    """Context for running work on a pool thread that keeps the calling component"""
+    context = copy_context()
+    context.run(_handed_off_by.set, _calling_component())
+    return context
+
+
+def _row_count(result) -> Optional[int]:
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict):
+        if 'inserted' in result:
+            return result['inserted']
+        rows = result.get('rows')
+        return len(rows) if isinstance(rows, list) else (1 if result else 0)
+    return None
+
+
+class QueryRecord:
+    """One top-level DatabaseManager call and the statements it ran"""
+
+    __slots__ = ("method", "component", "started", "wall_ms", "rows", "statements", "fingerprints",
+                 "error", "last_sql", "last_prefix", "last_fingerprint")
+
+    def __init__(self, method: str, component: str):
+        self.method = method
+        self.component = component
+        self.started = time.time()
+        self.wall_ms = 0.0
+        self.rows = None
+        self.statements = 0
+        # Executions per fingerprint, in first-seen order (at most MAX_FINGERPRINTS)
+        self.fingerprints: Counter = Counter()
+        self.error = None
+        self.last_sql = None
+        self.last_prefix = None
+        self.last_fingerprint = None
+
+    @property
+    def fingerprint(self) -> Optional[str]:
+        """Fingerprint of the first statement (None when served from the cache)"""
+        return next(iter(self.fingerprints), None)
+
+    def count(self, fingerprint: str, executions: int = 1):
+        """Count executions of a statement"""
+        self.statements += executions
+        self.last_fingerprint = fingerprint
+        if fingerprint in self.fingerprints or len(self.fingerprints) < MAX_FINGERPRINTS:
+            self.fingerprints[fingerprint] += executions
+
+    def as_dict(self) -> Dict:
+        return {
+            'method': self.method,
+            'component': self.component,
+            'started': self.started,
+            'wall_ms': self.wall_ms,
+            'rows': self.rows,
+            'statements': self.statements,
+            'fingerprint': self.fingerprint,
+            'error': self.error,
+        }
+
+
+_slow_loggers: Dict[str, logging.Logger] = {}
+_slow_logger_lock = threading.Lock()
+
+
+def _slow_query_logger(path: Optional[str]) -> logging.Logger:
+    """Logger writing to path (one file handler per path, none when path is empty)"""
+    with _slow_logger_lock:
+        logger = _slow_loggers.get(path or "")
+        if logger is None:
+            logger = logging.getLogger(f"court_management.slow_queries.{len(_slow_loggers)}")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            if path:
+                handler = logging.FileHandler(path, encoding="utf-8", delay=True)
+                handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+            else:
+                handler = logging.NullHandler()  # otherwise logging's last-resort handler prints to stderr
+            logger.addHandler(handler)
+            _slow_loggers[path or ""] = logger
+        return logger
+
+
+class QueryMetrics:
+    """In-process registry of DatabaseManager calls.
+
+    Keeps per-method counters and wall-time histograms, per-component call
+    and statement counts, and the most recent calls. Calls slower than
+    slow_query_ms, and calls that failed, go to the slow-query log.
+    """
+
+    def __init__(self, slow_query_ms: float = DEFAULT_SLOW_QUERY_MS,
+                 slow_query_log: Optional[str] = DEFAULT_SLOW_QUERY_LOG, recent: int = 200):
+        self.slow_query_ms = slow_query_ms
+        self.log = _slow_query_logger(slow_query_log)
+        self._lock = threading.Lock()
+        self._methods: Dict[str, Dict] = {}
+        self._components: Dict[str, Dict] = {}
+        self._recent = deque(maxlen=recent)
+
+    def trace(self, sql: str):
+        """sqlite3 trace callback: attach the statement to the call in progress"""
+        record = _current_call.get()
+        # Every statement a trigger runs is reported again with the SQL of the
+        # outer statement that fired it; count that statement once
+        if record is None or sql == record.last_sql or sql.startswith("--"):
+            return
+        # The next row of an executemany (or a loop over one statement) only
+        # differs in its values: count it without scanning the whole text again
+        first_value = _FIRST_VALUE.search(sql)
+        prefix = sql[:first_value.start()] if first_value else sql
+        if prefix == record.last_prefix:
+            record.last_sql = sql
+            record.count(record.last_fingerprint)
+            return
+        if _INTERNAL_STATEMENT.search(sql) or _PRAGMA_STATEMENT.match(sql):
+            return
+        if _CONTROL_STATEMENT.match(sql):
+            record.last_sql = record.last_prefix = None
+            return
+        record.last_sql, record.last_prefix = sql, prefix
+        record.count(fingerprint(sql))
+
+    @contextmanager
+    def untraced(self, conn, sql: str, executions: int):
+        """Run a block on conn without the trace, counting it as executions runs of sql if it succeeds.
+
+        For executemany over large batches, where tracing every row and every
+        trigger statement it fires costs more than the writes themselves.
+        """
+        conn.set_trace_callback(None)
+        try:
+            yield
+        finally:
+            conn.set_trace_callback(self.trace)
+        record = _current_call.get()
+        if record is not None:
+            record.last_sql = record.last_prefix = None
+            record.count(fingerprint(sql), executions)
+
+    def note_error(self, message: str):
+        """Mark the call in progress as failed"""
+        record = _current_call.get()
+        if record is not None:
+            record.error = message
+
+    def record(self, record: QueryRecord):
+        """Add a finished call to the counters and log it if slow or failed"""
+        slow = record.wall_ms >= self.slow_query_ms
+        with self._lock:
+            method = self._methods.get(record.method)
+            if method is None:
+                method = self._methods[record.method] = {
+                    'calls': 0, 'errors': 0, 'slow': 0, 'statements': 0, 'rows': 0,
+                    'total_ms': 0.0, 'max_ms': 0.0, 'histogram': [0] * (len(HISTOGRAM_BOUNDS_MS) + 1),
+                }
+            method['calls'] += 1
+            method['errors'] += record.error is not None
+            method['slow'] += slow
+            method['statements'] += record.statements
+            method['rows'] += record.rows or 0
+            method['total_ms'] += record.wall_ms
+            method['max_ms'] = max(method['max_ms'], record.wall_ms)
+            method['histogram'][bisect_left(HISTOGRAM_BOUNDS_MS, record.wall_ms)] += 1
+
+            component = self._components.setdefault(record.component, {'calls': 0, 'statements': 0})
+            component['calls'] += 1
+            component['statements'] += record.statements
+            self._recent.append(record)
+
+        if record.error is not None:
+            self.log.error(self._describe(record))
+        elif slow:
+            self.log.warning(self._describe(record))
+
+    def _describe(self, record: QueryRecord) -> str:
+        text = (f"{record.wall_ms:.1f} ms {record.method} [{record.component}] "
+                f"rows={record.rows} statements={record.statements} sql={record.fingerprint}")
+        return f"{text} error={record.error}" if record.error is not None else text
+
+    def method_stats(self) -> Dict[str, Dict]:
+        """Counters and histogram per method, with mean wall time"""
+        with self._lock:
+            return {
+                name: dict(stats, histogram=list(stats['histogram']), mean_ms=stats['total_ms'] / stats['calls'])
+                for name, stats in self._methods.items()
+            }
+
+    def component_stats(self) -> Dict[str, Dict]:
+        """Calls and statements issued per calling component"""
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._components.items()}
+
+    def recent(self, limit: Optional[int] = None) -> List[Dict]:
+        """Most recent calls, newest first"""
+        with self._lock:
+            records = list(self._recent)[::-1]
+        return [record.as_dict() for record in records[:limit]]
+
+    def reset(self):
+        """Forget everything recorded so far"""
+        with self._lock:
+            self._methods.clear()
+            self._components.clear()
+            self._recent.clear()
+
+
+def instrumented(cls):
+    """Record every public method call of a DatabaseManager class in self.metrics.
+
+    Only the outermost call is recorded; statements run by methods it calls
+    count towards it.
+    """
+    for name, attribute in list(vars(cls).items()):
+        if name.startswith("_") or not callable(attribute) or getattr(attribute, "skip_metrics", False):
+            continue
+        setattr(cls, name, _instrument(attribute))
+    return cls
+
+
+def not_instrumented(method):
+    """Leave a method out of @instrumented (e.g. context managers and connection accessors)"""
+    method.skip_metrics = True
+    return method
+
+
+def _instrument(method):
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if _current_call.get() is not None:
+            return method(self, *args, **kwargs)
+
+        record = QueryRecord(method.__name__, _calling_component())
+        token = _current_call.set(record)
+        start = time.perf_counter()
+        try:
+            result = method(self, *args, **kwargs)
+            record.rows = _row_count(result)
+            return result
+        except Exception as e:
+            record.error = str(e)
+            raise
+        finally:
+            record.wall_ms = (time.perf_counter() - start) * 1000
+            _current_call.reset(token)
+            self.metrics.record(record)
+    return wrapper
@@ -0,0 +1,35 @@
+import os
+from database_operations import db_manager
+
+def rebuild_stats():
+    """Reconcile active employee counts and recompute the rollup tables"""
+    
+    if not os.path.exists(db_manager.db_path):
+        print(f"❌ Database not found: {db_manager.db_path}")
+        return
+    
+    # Creates the rollup tables first on databases that predate them
+    if not db_manager.ensure_schema():
+        print("❌ Error applying schema")
+        return
+    
+    # Repair any drift in the per-post counters the rollups are built from
+    mismatches = db_manager.reconcile_active_employee_counts(fix=True)
+    if mismatches:
+        print(f"⚠️ Corrected {len(mismatches)} post allocation counts:")
+        for row in mismatches:
+            print(f"   - court {row['court_id']}, post {row['post_id']}: "
+                  f"{row['stored']} -> {row['actual']}")
+    else:
+        print("✅ Active employee counts match a full recount")
+    
+    if db_manager.rebuild_stats():
+        print("✅ Rollup statistics rebuilt successfully!")
+        for division in db_manager.get_division_rollup().values():
+            print(f"   - {division['division_name']}: {division['employees']} employees, "
+                  f"{division['vacancies']} vacancies")
+    else:
+        print("❌ Error rebuilding statistics")
+
+if __name__ == "__main__":
+    rebuild_stats()
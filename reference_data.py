@@ -0,0 +1,96 @@
+import threading
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+from database_operations import db_manager, DatabaseManager
+from query_cache import read_failed, reset_failure
+
+# Tables the registry mirrors; a write to any of them triggers a reload
+REFERENCE_TABLES = ("posts", "courts", "divisions")
+
+
+def post_label(post: Mapping) -> str:
+    """Display label of a post, as shown in post pickers"""
+    return f"{post['post_name']} ({post['post_class']})"
+
+
+def court_label(court: Mapping) -> str:
+    """Display label of a court, as shown in court pickers"""
+    return f"{court['court_name']} ({court['division_name']})"
+
+
+def _freeze_rows(rows: Iterable[Dict]) -> Tuple[Mapping, ...]:
+    return tuple(MappingProxyType(dict(row)) for row in rows)
+
+
+def _index(rows: Iterable[Mapping], key) -> Mapping:
+    return MappingProxyType({key(row): row for row in rows})
+
+
+class ReferenceData:
+    """Immutable snapshot of posts, courts and divisions, indexed by id and label"""
+
+    def __init__(self, posts: Iterable[Dict], courts: Iterable[Dict], divisions: Iterable[Dict]):
+        self.posts = _freeze_rows(posts)
+        self.posts_by_id = _index(self.posts, lambda post: post['post_id'])
+        self.posts_by_label = _index(self.posts, post_label)
+
+        self.courts = _freeze_rows(courts)
+        self.courts_by_id = _index(self.courts, lambda court: court['court_id'])
+        self.courts_by_label = _index(self.courts, court_label)
+        by_division: Dict[int, list] = {}
+        for court in sorted(self.courts, key=lambda court: court['court_name']):
+            by_division.setdefault(court['parent_division_id'], []).append(court)
+        self.courts_by_division = MappingProxyType({division_id: tuple(courts)
+                                                   for division_id, courts in by_division.items()})
+
+        self.divisions = _freeze_rows(divisions)
+        self.divisions_by_id = _index(self.divisions, lambda division: division['division_id'])
+        # Divisions with a parent are the selectable ones (the root is the sessions court itself)
+        self.sub_divisions = tuple(division for division in self.divisions
+                                   if division['parent_division_id'] is not None)
+
+    def courts_in_division(self, division_id: int) -> Tuple[Mapping, ...]:
+        """Courts of a division, ordered by name"""
+        return self.courts_by_division.get(division_id, ())
+
+
+class ReferenceRegistry:
+    """Process-wide ReferenceData shared by every session.
+
+    The snapshot is rebuilt only when the query cache generation of posts,
+    courts or divisions moves, i.e. after this manager writes to one of them,
+    or after a full cache clear (a restore, or any write by another
+    connection); otherwise every caller gets the same immutable object
+    without a query.
+    """
+
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+        self._lock = threading.Lock()
+        self._data: Optional[ReferenceData] = None
+        self._generation = None
+        self.loads = 0
+
+    def current(self) -> ReferenceData:
+        """The snapshot for the current data generation, loading it if needed"""
+        generation = self.db.cache.generation(REFERENCE_TABLES)
+        data = self._data
+        if data is not None and self._generation == generation:
+            return data
+
+        with self._lock:
+            if self._data is not None and self._generation == generation:
+                return self._data
+            reset_failure()
+            data = ReferenceData(self.db.get_all_posts(), self.db.get_all_courts(),
+                                 self.db.get_all_divisions())
+            self.loads += 1
+            # Keep a snapshot built from failed reads only until the next call
+            if not read_failed():
+                self._data, self._generation = data, generation
+            return data
+
+
+# Global registry instance
+reference_data = ReferenceRegistry(db_manager)
@@ -1,5 +1,5 @@
 import streamlit as st
-from database_operations import db_manager
+from reference_data import reference_data
 from typing import Optional, Tuple
 
 class SidebarComponent:
@@ -47,7 +47,8 @@ class SidebarComponent:
             
             # Divisions dropdown (only divisions with parent_id != NULL)
             st.subheader("🏛️ Select Division")
-            divisions = db_manager.get_divisions_with_parent()
+            reference = reference_data.current()
+            divisions = reference.sub_divisions
             
             if not divisions:
                 st.warning("No divisions found. Please add divisions first.")
@@ -71,7 +72,7 @@ class SidebarComponent:
                 
                 if selected_division_id == "all":
                     # Show all courts when "All Divisions" is selected
-                    courts = db_manager.get_all_courts()
+                    courts = reference.courts
                     court_options = {"All Courts": "all"}  # Add "All Courts" option
                     
                     if courts:
@@ -95,7 +96,7 @@ class SidebarComponent:
                         
                 else:
                     # Show courts for specific division
-                    courts = db_manager.get_courts_by_division(selected_division_id)
+                    courts = reference.courts_in_division(selected_division_id)
                     court_options = {"All Courts": "all"}  # Add "All Courts" option
                     
                     if not courts:
@@ -147,7 +148,7 @@ class SidebarComponent:
     
     def get_selected_info(self) -> Tuple[str, str]:
         """Get the display names of selected division and court"""
-        divisions = db_manager.get_divisions_with_parent()
+        divisions = reference_data.current().sub_divisions
         division_dict = {div['division_id']: div['division_name'] for div in divisions}
         
         # Get current selection from session state
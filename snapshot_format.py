@@ -0,0 +1,156 @@
+import gzip
+import hashlib
+import io
+import json
+import sqlite3
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+try:
+    import zstandard
+except ImportError:  # optional: only needed for .sql.zst snapshots
+    zstandard = None
+
+# Format 1 is the original one-INSERT-per-row text dump (no metadata lines).
+# Format 2 adds multi-row INSERT batches, a "-- @table" checksum line after
+# each table's data and a closing "-- @manifest" line; it is usually written
+# compressed but stays plain SQL, so both formats restore through one parser.
+SNAPSHOT_FORMAT = 2
+META_PREFIX = "-- @"
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+COMPRESSION_EXTENSIONS = {"gzip": ".sql.gz", "zstd": ".sql.zst", None: ".sql"}
+
+
+def sql_literal(value) -> str:
+    """Render a raw SQLite value as an SQL literal"""
+    if value is None:
+        return "NULL"
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        if value != value:
+            return "NULL"
+        if value in (float("inf"), float("-inf")):
+            return "9e999" if value > 0 else "-9e999"
+        return repr(value)
+    if isinstance(value, bytes):
+        return f"X'{value.hex()}'"
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def quote_identifier(name: str) -> str:
+    """Double-quote a table or column name"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def insert_batches(table: str, columns: Sequence[str], rows: Iterable[Sequence],
+                   batch_rows: int = 500) -> Iterator[Tuple[str, int]]:
+    """Yield (multi-row INSERT statement, row count) for batches of rows"""
+    prefix = (f"INSERT INTO {quote_identifier(table)} "
+              f"({', '.join(quote_identifier(column) for column in columns)}) VALUES\n")
+    batch: List[str] = []
+    for row in rows:
+        batch.append("(" + ", ".join(sql_literal(value) for value in row) + ")")
+        if len(batch) == batch_rows:
+            yield prefix + ",\n".join(batch) + ";\n", len(batch)
+            batch = []
+    if batch:
+        yield prefix + ",\n".join(batch) + ";\n", len(batch)
+
+
+def meta_line(kind: str, payload: Dict) -> str:
+    """Render a metadata comment line such as '-- @table {...}'"""
+    return f"{META_PREFIX}{kind} {json.dumps(payload, sort_keys=True)}\n"
+
+
+def open_writer(target, compression: str = "gzip"):
+    """Wrap a binary target in the requested compressor (caller closes the result)"""
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=target, mode="wb")
+    if compression == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd snapshots need the 'zstandard' package")
+        return zstandard.ZstdCompressor().stream_writer(target, closefd=False)
+    if compression is None:
+        return target
+    raise ValueError(f"Unknown snapshot compression: {compression}")
+
+
+def open_reader(snapshot):
+    """Return a line-iterable stream for a snapshot, decompressing by magic number.
+
+    Accepts a string, a text stream or a binary stream; binary streams must be
+    seekable so the first bytes can be inspected.
+    """
+    if isinstance(snapshot, str):
+        return io.StringIO(snapshot)
+    if isinstance(snapshot, io.TextIOBase):
+        return snapshot
+
+    start = snapshot.tell()
+    magic = snapshot.read(4)
+    snapshot.seek(start)
+    if magic.startswith(GZIP_MAGIC):
+        return gzip.GzipFile(fileobj=snapshot, mode="rb")
+    if magic.startswith(ZSTD_MAGIC):
+        if zstandard is None:
+            raise ValueError("This snapshot is zstd-compressed; install the 'zstandard' package to restore it")
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(snapshot, closefd=False))
+    return snapshot
+
+
+def iter_snapshot(stream) -> Iterator[Tuple[str, object]]:
+    """Yield ('statement', sql) and ('snapshot' | 'table' | 'manifest', payload) items from a snapshot stream"""
+    parts: List[str] = []
+    for line in stream:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if not parts:
+            stripped = line.strip()
+            if stripped.startswith(META_PREFIX):
+                kind, _, payload = stripped[len(META_PREFIX):].partition(" ")
+                yield kind, json.loads(payload)
+                continue
+            if not stripped or stripped.startswith("--"):
+                continue
+        parts.append(line)
+        # Only a line ending in ';' can finish a statement, so the join and the
+        # complete_statement check run once per candidate, not once per line
+        if line.rstrip().endswith(";"):
+            statement = "".join(parts)
+            if sqlite3.complete_statement(statement):
+                yield "statement", statement
+                parts = []
+    if "".join(parts).strip():
+        raise ValueError("Snapshot ends with an incomplete SQL statement")
+
+
+def insert_target(statement: str):
+    """Table name an INSERT statement writes to, or None"""
+    head = statement.lstrip()
+    if not head[:11].upper().startswith("INSERT INTO"):
+        return None
+    name = head[11:].lstrip()
+    if name.startswith('"'):
+        end = name.find('"', 1)
+        while end != -1 and name[end + 1:end + 2] == '"':
+            end = name.find('"', end + 2)
+        return name[1:end].replace('""', '"')
+    return name.split("(", 1)[0].split()[0]
+
+
+class ChecksumTracker:
+    """Running per-table SHA-256 over the INSERT statements of a snapshot"""
+
+    def __init__(self):
+        self._hashes: Dict[str, "hashlib._Hash"] = {}
+
+    def update(self, table: str, statement: str):
+        """Fold one INSERT statement into its table's checksum"""
+        self._hashes.setdefault(table, hashlib.sha256()).update(statement.encode("utf-8"))
+
+    def hexdigest(self, table: str) -> str:
+        """Checksum of everything seen so far for a table"""
+        return self._hashes.get(table, hashlib.sha256()).hexdigest()
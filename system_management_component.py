@@ -1,7 +1,16 @@
 import streamlit as st
 import pandas as pd
+import io
+import os
+import tempfile
 from datetime import date, datetime, timedelta
 from database_operations import db_manager
+from export_pipeline import export_csv
+from fragments import rerun_section, section_fragment
+from snapshot_format import COMPRESSION_EXTENSIONS
+from query_cache import current_scope, last_scope_stats
+from reference_data import reference_data
+from parallel_loader import format_timings, load_panels
 from typing import Dict, List, Optional
 
 class SystemManagementComponent:
@@ -9,13 +18,28 @@ class SystemManagementComponent:
         self.divisions = []
         self.courts = []
         self.employees = []
+        self.snapshot = {}
+        self.timings = {}
     
     def render_system_overview(self):
         """Render system-wide overview"""
-        # Get all divisions and courts
-        self.divisions = db_manager.get_divisions_with_parent()
-        self.courts = db_manager.get_all_courts()
-        self.employees = db_manager.get_all_employees()
+        # Summary counters, division rollup and upcoming retirements are independent
+        # reads, so they run side by side and the page waits only for the slowest;
+        # each panel is consistent on its own, not as of one shared transaction
+        today = date.today()
+        panels, self.timings = load_panels({
+            'summary': db_manager.get_system_summary,
+            'division_rollup': db_manager.get_division_rollup,
+            'retirements': lambda: db_manager.get_employees_retiring_between(today, today + timedelta(days=60)),
+        })
+        self.snapshot = {
+            'summary': panels['summary'] or {},
+            'division_rollup': panels['division_rollup'] or {},
+            'retirements': panels['retirements'] or [],
+        }
+        reference = reference_data.current()
+        self.divisions = reference.sub_divisions
+        self.courts = reference.courts
         
         # Display main heading
         st.markdown(f"""
@@ -62,15 +86,18 @@ class SystemManagementComponent:
         st.markdown("---")
         st.subheader("💾 Database Management")
         self._render_database_management()
+        
+        st.caption(f"⏱️ {format_timings(self.timings)}")
     
     def _render_system_summary(self):
         """Render system summary statistics"""
-        # Calculate system-wide statistics
-        total_divisions = len(self.divisions)
-        total_courts = len(self.courts)
-        total_employees = len(self.employees)
-        total_posts = len(db_manager.get_all_posts())
-        total_vacancies = db_manager.get_system_vacancy_count()
+        # System-wide statistics from the summary panel
+        summary = self.snapshot.get('summary', {})
+        total_divisions = summary.get('total_divisions', 0)
+        total_courts = summary.get('total_courts', 0)
+        total_employees = summary.get('total_employees', 0)
+        total_posts = summary.get('total_posts', 0)
+        total_vacancies = summary.get('total_vacancies', 0)
         
         col1, col2, col3, col4, col5 = st.columns(5)
         with col1:
@@ -90,24 +117,29 @@ class SystemManagementComponent:
             st.info("No divisions found.")
             return
         
+        # Per-division totals and court rows come from the rollup panel
+        rollup = self.snapshot.get('division_rollup', {})
+        
         for division in self.divisions:
-            division_id = division['division_id']
             division_name = division['division_name']
+            division_rollup = rollup.get(division['division_id'], {})
             
             # Get division statistics
-            division_employee_count = db_manager.get_employee_count_by_division(division_id)
-            division_vacancy_count = db_manager.get_vacancy_count_by_division(division_id)
+            division_employee_count = division_rollup.get('employees', 0)
+            division_vacancy_count = division_rollup.get('vacancies', 0)
             
             # Get courts in this division
-            division_courts = db_manager.get_courts_by_division(division_id)
+            division_courts = division_rollup.get('courts', [])
             
             # Create expandable section for each division
             with st.expander(f"🏛️ {division_name} ({division_employee_count} employees, {division_vacancy_count} vacancies)"):
                 # Division summary
-                col1, col2 = st.columns(2)
+                col1, col2, col3 = st.columns(3)
                 with col1:
                     st.write(f"**Total Employees:** {division_employee_count}")
                 with col2:
+                    st.write(f"**Sanctioned Posts:** {division_rollup.get('sanctioned_posts', 0)}")
+                with col3:
                     st.write(f"**Total Vacancies:** {division_vacancy_count}")
                 
                 # Courts list
@@ -115,15 +147,12 @@ class SystemManagementComponent:
                     st.write("**Courts:**")
                     court_data = []
                     for court in division_courts:
-                        court_id = court['court_id']
-                        court_employee_count = db_manager.get_employee_count_by_court(court_id)
-                        court_vacancy_count = db_manager.get_vacancy_count_by_court(court_id)
-                        
                         court_data.append({
                             'Court Name': court['court_name'],
                             'Court Number': court['court_number'] or 'N/A',
-                            'Employees': court_employee_count,
-                            'Vacancies': court_vacancy_count
+                            'Employees': court['employees'],
+                            'Sanctioned Posts': court['sanctioned_posts'],
+                            'Vacancies': court['vacancies']
                         })
                     
                     df_courts = pd.DataFrame(court_data)
@@ -133,12 +162,8 @@ class SystemManagementComponent:
     
     def _render_upcoming_retirements(self):
         """Render upcoming retirements in next 2 months"""
-        # Calculate date range for next 2 months
-        today = date.today()
-        two_months_later = today + timedelta(days=60)
-        
-        # Get employees retiring in next 2 months
-        retiring_employees = db_manager.get_employees_retiring_between(today, two_months_later)
+        # Employees retiring in next 2 months come from the retirements panel
+        retiring_employees = self.snapshot.get('retirements', [])
         
         if retiring_employees:
             # Create DataFrame for display
@@ -159,6 +184,7 @@ class SystemManagementComponent:
         else:
             st.info("No employees retiring in the next 2 months.")
     
+    @section_fragment
     def _render_quick_actions(self):
         """Render quick action buttons"""
         col1, col2, col3 = st.columns(3)
@@ -175,23 +201,76 @@ class SystemManagementComponent:
             if st.button("📥 Export All Data"):
                 self._export_all_data()
     
+    @section_fragment
     def _render_database_management(self):
         """Render database management section"""
         # Check if current user is admin
         current_user = st.session_state.get('user')
         if current_user and current_user.get('role') == 'admin':
-            col1, col2 = st.columns(2)
+            col1, col2, col3 = st.columns(3)
             
             with col1:
                 if st.button("📤 Export Database Snapshot", key="export_db"):
                     self._export_database_snapshot()
             
             with col2:
+                if st.button("💾 Binary Snapshot", key="backup_db"):
+                    self._export_binary_snapshot()
+            
+            with col3:
                 if st.button("📥 Restore Database", key="restore_db"):
                     self._show_restore_database()
+            
+            # Show whether the read-through query cache is paying off
+            cache_stats = db_manager.cache.stats()
+            st.caption(
+                f"Query cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+                f"({cache_stats['hit_rate']:.0%} hit rate), "
+                f"{cache_stats['entries']} of {cache_stats['max_entries']} entries"
+            )
+            scope = current_scope()
+            scope_stats = scope.stats() if scope is not None else last_scope_stats()
+            if scope_stats:
+                st.caption(
+                    f"This rerun: {scope_stats['calls']} reads, "
+                    f"{scope_stats['duplicates']} duplicates served from the request scope"
+                )
+            self._show_query_metrics()
         else:
             st.info("🔒 Database management features are only available to administrators.")
     
+    def _show_query_metrics(self):
+        """Show per-method query timings and which components issue the most queries"""
+        method_stats = db_manager.metrics.method_stats()
+        with st.expander("📈 Query Metrics"):
+            if not method_stats:
+                st.info("No database calls recorded yet.")
+                return
+
+            methods_df = pd.DataFrame([
+                {
+                    'Method': name,
+                    'Calls': stats['calls'],
+                    'Queries': stats['statements'],
+                    'Mean (ms)': round(stats['mean_ms'], 1),
+                    'Max (ms)': round(stats['max_ms'], 1),
+                    'Total (ms)': round(stats['total_ms'], 1),
+                    'Slow': stats['slow'],
+                    'Errors': stats['errors'],
+                }
+                for name, stats in method_stats.items()
+            ]).sort_values('Total (ms)', ascending=False)
+            st.dataframe(methods_df, use_container_width=True, hide_index=True)
+
+            components_df = pd.DataFrame([
+                {'Component': name, 'Calls': stats['calls'], 'Queries': stats['statements']}
+                for name, stats in db_manager.metrics.component_stats().items()
+            ]).sort_values('Queries', ascending=False)
+            st.dataframe(components_df, use_container_width=True, hide_index=True)
+            st.caption(f"Calls slower than {db_manager.metrics.slow_query_ms:.0f} ms and failed calls "
+                       f"are written to the slow-query log")
+
+    @section_fragment
     def _render_system_management(self):
         """Render system management options"""
         col1, col2 = st.columns(2)
@@ -208,24 +287,19 @@ class SystemManagementComponent:
         """Show vacancy summary table"""
         st.write("### 📋 Vacancy Summary")
         
-        # Get vacancy data for all courts
+        # Posts with vacancies in every court, from one grouped query
         vacancy_data = []
-        for court in self.courts:
-            court_id = court['court_id']
-            court_posts = db_manager.get_court_posts_with_vacancies(court_id)
-            
-            for post in court_posts:
-                if post['available_vacancies'] > 0:  # Only show posts with vacancies
-                    vacancy_data.append({
-                        'Division': court['division_name'],
-                        'Court Name': court['court_name'],
-                        'Court Number': court['court_number'] or 'N/A',
-                        'Post': post['post_name'],
-                        'Class': post['post_class'],
-                        'Sanctioned': post['sanctioned_vacancies'],
-                        'Current': post['active_employees_count'],
-                        'Vacancies': post['available_vacancies']
-                    })
+        for post in db_manager.get_vacancy_summary():
+            vacancy_data.append({
+                'Division': post['division_name'],
+                'Court Name': post['court_name'],
+                'Court Number': post['court_number'] or 'N/A',
+                'Post': post['post_name'],
+                'Class': post['post_class'],
+                'Sanctioned': post['sanctioned_vacancies'],
+                'Current': post['active_employees_count'],
+                'Vacancies': post['available_vacancies']
+            })
         
         if vacancy_data:
             df_vacancies = pd.DataFrame(vacancy_data)
@@ -293,86 +367,17 @@ class SystemManagementComponent:
     
     def _export_all_data(self):
         """Export all employees data to CSV"""
-        if self.employees:
-            df = pd.DataFrame(self.employees)
-            
-            # Add missing columns from court and division details
-            df['division_name'] = df['court_id'].map(lambda x: self._get_division_name_by_court(x))
-            
-            # Add court information for each employee
-            court_info = {}
-            for court in self.courts:
-                court_info[court['court_id']] = {
-                    'court_number': court['court_number'],
-                    'court_name': court['court_name'],
-                    'officer_name': court.get('officer_name', '')
-                }
-            
-            df['court_number'] = df['court_id'].map(lambda x: court_info.get(x, {}).get('court_number', ''))
-            df['court_name'] = df['court_id'].map(lambda x: court_info.get(x, {}).get('court_name', ''))
-            df['officer_name'] = df['court_id'].map(lambda x: court_info.get(x, {}).get('officer_name', ''))
-            
-            # Add sanctioned vacancies from posts data
-            post_vacancies = {}
-            for court in self.courts:
-                court_posts = db_manager.get_court_posts_with_vacancies(court['court_id'])
-                for post in court_posts:
-                    key = f"{post['post_name']}_{court['court_id']}"
-                    post_vacancies[key] = post['sanctioned_vacancies']
-            
-            df['post_court_key'] = df['post_name'] + '_' + df['court_id'].astype(str)
-            df['sanctioned_vacancies'] = df['post_court_key'].map(post_vacancies).fillna(0)
-            
-            # Reorder and rename columns for export
-            column_mapping = {
-                'employee_id': 'Employee ID',
-                'division_name': 'Division',
-                'court_number': 'Court Number', 
-                'court_name': 'Court Name',
-                'officer_name': 'Officer Name',
-                'post_name': 'Post',
-                'post_class': 'Class',
-                'sanctioned_vacancies': 'Sanctioned Vacancies',
-                'name': 'Employee Name',
-                'gender': 'Gender',
-                'father_name': "Father's Name",
-                'date_of_birth': 'Date of Birth',
-                'qualifications': 'Qualification',
-                'retirement_date': 'Retirement Date'
-            }
-            
-            # Select and rename columns in the desired order
-            export_columns = [
-                'employee_id', 'division_name', 'court_number', 'court_name', 
-                'officer_name', 'post_name', 'post_class', 'sanctioned_vacancies',
-                'name', 'gender', 'father_name', 'date_of_birth', 
-                'qualifications', 'retirement_date'
-            ]
-            
-            # Filter dataframe to only include available columns
-            available_columns = [col for col in export_columns if col in df.columns]
-            df_export = df[available_columns].copy()
-            
-            # Rename columns
-            df_export = df_export.rename(columns=column_mapping)
-            
-            csv = df_export.to_csv(index=False)
+        # The CSV is only built when the button is clicked
+        if db_manager.count_employees():
             st.download_button(
                 label="📥 Download All Data (CSV)",
-                data=csv,
+                data=export_csv,
                 file_name=f"all_employees_{date.today().strftime('%Y%m%d')}.csv",
                 mime="text/csv"
             )
         else:
             st.info("No employees found in the system.")
     
-    def _get_division_name_by_court(self, court_id):
-        """Helper method to get division name by court ID"""
-        for court in self.courts:
-            if court['court_id'] == court_id:
-                return court['division_name']
-        return ''
-    
     def _show_create_court_form(self):
         """Show create court form"""
         with st.form("create_court_form"):
@@ -385,7 +390,7 @@ class SystemManagementComponent:
             
             with col2:
                 # Division selection
-                divisions = db_manager.get_divisions_with_parent()
+                divisions = reference_data.current().sub_divisions
                 division_options = {div['division_name']: div['division_id'] for div in divisions}
                 selected_division = st.selectbox("Division *", options=list(division_options.keys()))
                 division_id = division_options[selected_division]
@@ -409,7 +414,7 @@ class SystemManagementComponent:
                         st.error("Failed to create court.")
             
             if cancel:
-                st.rerun()
+                rerun_section()
     
     def _show_create_post_form(self):
         """Show create post form"""
@@ -440,89 +445,117 @@ class SystemManagementComponent:
                         st.error("Failed to create post.")
             
             if cancel:
-                st.rerun()
+                rerun_section()
     
     def _export_database_snapshot(self):
-        """Export database as SQL snapshot"""
+        """Export database as a compressed SQL snapshot"""
         try:
-            sql_dump = db_manager.export_database_snapshot()
-            if sql_dump:
+            # download_button needs the whole payload anyway, so build it in memory
+            snapshot_file = io.BytesIO()
+            manifest = db_manager.export_database_snapshot(snapshot_file, compression="gzip")
+            if manifest is not None:
                 # Create filename with timestamp
-                from datetime import datetime
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"jind_court_database_snapshot_{timestamp}.sql"
+                filename = f"jind_court_database_snapshot_{timestamp}{COMPRESSION_EXTENSIONS['gzip']}"
                 
                 st.download_button(
                     label="📥 Download Database Snapshot",
-                    data=sql_dump,
+                    data=snapshot_file.getvalue(),
                     file_name=filename,
-                    mime="text/plain",
-                    help="Download complete database backup as SQL file"
+                    mime="application/gzip",
+                    help="Download complete database backup as gzip-compressed SQL"
                 )
-                st.success("Database snapshot ready for download!")
+                total_rows = sum(table['rows'] for table in manifest.values())
+                st.success(f"Database snapshot ready for download! ({len(manifest)} tables, {total_rows:,} rows)")
             else:
                 st.error("Failed to export database snapshot.")
         except Exception as e:
             st.error(f"Error exporting database: {e}")
     
+    def _export_binary_snapshot(self):
+        """Export a point-in-time copy of the database file via the backup API"""
+        progress_bar = st.progress(0.0, text="Copying database pages...")
+        
+        def update_progress(copied, total):
+            progress_bar.progress(copied / total if total else 1.0, text=f"Copied {copied} of {total} pages")
+        
+        fd, snapshot_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        try:
+            if db_manager.backup_snapshot(snapshot_path, progress=update_progress):
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                with open(snapshot_path, 'rb') as snapshot_file:
+                    st.download_button(
+                        label="📥 Download Binary Snapshot",
+                        data=snapshot_file,
+                        file_name=f"jind_court_database_snapshot_{timestamp}.db",
+                        mime="application/vnd.sqlite3",
+                        help="Download a consistent copy of the SQLite database file"
+                    )
+                st.success("Binary snapshot ready for download!")
+            else:
+                st.error("Failed to create binary snapshot.")
+        finally:
+            os.remove(snapshot_path)
+    
     def _show_restore_database(self):
         """Show database restore interface"""
         st.warning("⚠️ **Warning:** This will replace all current data!")
         
         uploaded_file = st.file_uploader(
             "Choose SQL database snapshot file",
-            type=['sql'],
+            type=['sql', 'gz', 'zst'],
             help="Upload a previously exported database snapshot"
         )
         
         if uploaded_file is not None:
             try:
-                # Read the uploaded file
-                sql_content = uploaded_file.read().decode('utf-8')
-                
-                # Show preview of the file
+                # Show preview of the file without decoding the whole upload
                 st.info(f"📄 File uploaded: {uploaded_file.name}")
-                st.info(f"📏 File size: {len(sql_content)} characters")
+                st.info(f"📏 File size: {uploaded_file.size:,} bytes")
                 
-                # Show first few lines as preview
-                lines = sql_content.split('\n')[:5]
+                preview = uploaded_file.read(4096).decode('utf-8', errors='replace')
+                uploaded_file.seek(0)
+                lines = preview.split('\n')[:5]
                 st.text("📋 File preview:")
                 for line in lines:
                     st.text(line)
-                if len(sql_content.split('\n')) > 5:
-                    st.text("... (file continues)")
+                st.text("... (file continues)")
                 
                 if st.button("🔄 Restore Database", type="primary"):
-                    with st.spinner("Restoring database..."):
-                        try:
-                            result = db_manager.import_database_snapshot(sql_content)
-                            if result:
-                                st.success("✅ Database restored successfully!")
-                                st.info("Please refresh the page to see the restored data.")
+                    progress_bar = st.progress(0.0, text="Restoring database...")
+                    
+                    def update_progress(fraction, message):
+                        progress_bar.progress(min(fraction, 1.0), text=message)
+                    
+                    try:
+                        # Streams the upload into a staging database; the live
+                        # database is only replaced if every statement applies
+                        result = db_manager.import_database_snapshot(uploaded_file, progress=update_progress)
+                        if result:
+                            st.success("✅ Database restored successfully!")
+                            
+                            # Show what was imported
+                            with db_manager.get_connection() as conn:
+                                cursor = conn.cursor()
                                 
-                                # Show what was imported
-                                with sqlite3.connect("court_management.db") as conn:
-                                    cursor = conn.cursor()
-                                    
-                                    # Count data
-                                    cursor.execute("SELECT COUNT(*) FROM divisions")
-                                    div_count = cursor.fetchone()[0]
-                                    cursor.execute("SELECT COUNT(*) FROM courts")
-                                    court_count = cursor.fetchone()[0]
-                                    cursor.execute("SELECT COUNT(*) FROM posts")
-                                    post_count = cursor.fetchone()[0]
-                                    cursor.execute("SELECT COUNT(*) FROM employees")
-                                    emp_count = cursor.fetchone()[0]
-                                    
-                                    st.info(f"📊 Imported: {div_count} divisions, {court_count} courts, {post_count} posts, {emp_count} employees")
+                                # Count data
+                                cursor.execute("SELECT COUNT(*) FROM divisions")
+                                div_count = cursor.fetchone()[0]
+                                cursor.execute("SELECT COUNT(*) FROM courts")
+                                court_count = cursor.fetchone()[0]
+                                cursor.execute("SELECT COUNT(*) FROM posts")
+                                post_count = cursor.fetchone()[0]
+                                cursor.execute("SELECT COUNT(*) FROM employees")
+                                emp_count = cursor.fetchone()[0]
                                 
-                                st.rerun()
-                            else:
-                                st.error("❌ Failed to restore database.")
-                                st.error("Please check the file format and try again.")
-                        except Exception as e:
-                            st.error(f"❌ Error during restore: {str(e)}")
-                            st.error("Please try again or contact administrator.")
+                                st.info(f"📊 Imported: {div_count} divisions, {court_count} courts, {post_count} posts, {emp_count} employees")
+                        else:
+                            st.error("❌ Failed to restore database. The current data was left unchanged.")
+                            st.error("Please check the file format and try again.")
+                    except Exception as e:
+                        st.error(f"❌ Error during restore: {str(e)}")
+                        st.error("Please try again or contact administrator.")
                         
             except Exception as e:
                 st.error(f"Error reading file: {e}")
@@ -0,0 +1,51 @@
+import os
+import sys
+from datetime import date
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+from database_operations import DatabaseManager  # noqa: E402
+
+SCHEMA_PATH = os.path.join(REPO_DIR, "database_schema.sql")
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "court_management.db")
+
+
+@pytest.fixture
+def manager(db_path):
+    """A DatabaseManager on a fresh database with the full schema applied (outside writes are polled on every read)"""
+    manager = DatabaseManager(db_path, slow_query_log=None, cache_poll_interval=0)
+    assert manager.ensure_schema(SCHEMA_PATH)
+    return manager
+
+
+@pytest.fixture
+def posts(manager):
+    """Default post ids by name"""
+    return {post['post_name']: post['post_id'] for post in manager.get_all_posts()}
+
+
+@pytest.fixture
+def court_id(manager):
+    """A court in the default division"""
+    assert manager.add_court("Civil Court", "1", "Officer", "Jind", 1)
+    return manager.get_all_courts()[0]['court_id']
+
+
+def employee_data(court_id, post_id, name="Ram Kumar", **overrides):
+    """Fields add_employee expects, with sensible defaults"""
+    data = {
+        'name': name, 'father_name': "Shyam Lal", 'date_of_birth': date(1970, 5, 17),
+        'qualifications': "BA", 'caste': None, 'gender': "Male", 'branch': "Civil",
+        'post_id': post_id, 'date_of_joining': date(1995, 1, 2), 'address': "Jind",
+        'acr': None, 'salary': 30000, 'court_id': court_id,
+    }
+    data.update(overrides)
+    return data
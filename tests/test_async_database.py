@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+import pytest
+
+from async_database import AsyncDatabaseManager
+
+from tests.conftest import employee_data
+
+
+def test_getters_and_writers_run_as_coroutines(manager, court_id, posts):
+    async def scenario():
+        async with AsyncDatabaseManager(manager, max_concurrency=2) as db:
+            assert await db.add_employee(employee_data(court_id, posts['Clerk']))
+            counts = await asyncio.gather(*(db.count_employees() for _ in range(5)))
+            return counts, await db.get_court_details(court_id), await db.get_court_employees(court_id)
+
+    counts, court, employees = asyncio.run(scenario())
+    assert counts == [1] * 5
+    assert court['court_name'] == "Civil Court"
+    assert [employee['name'] for employee in employees] == ["Ram Kumar"]
+
+
+def test_facade_shares_the_managers_cache_and_writer(manager, court_id):
+    assert manager.get_court_details(court_id)['court_name'] == "Civil Court"
+    jobs_before = manager.writer.stats()['jobs']
+
+    async def rename():
+        async with AsyncDatabaseManager(manager) as db:
+            assert db.db is manager
+            return await db.update_court_details(court_id, "Renamed", "1", "Officer", "Jind")
+
+    assert asyncio.run(rename())
+    assert manager.get_court_details(court_id)['court_name'] == "Renamed"
+    assert manager.writer.stats()['jobs'] == jobs_before + 1
+
+
+def test_only_public_getters_and_writers_are_exposed(manager):
+    db = AsyncDatabaseManager(manager)
+    with pytest.raises(AttributeError):
+        db.get_connection
+    with pytest.raises(AttributeError):
+        db.iter_query
+    with pytest.raises(AttributeError):
+        db._fetch_all
+
+
+def test_cancelling_a_read_interrupts_its_statement(manager):
+    manager.get_endless_count = lambda: manager._fetch_all(
+        "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) SELECT COUNT(*) FROM n"
+    )
+
+    async def scenario():
+        async with AsyncDatabaseManager(manager, max_concurrency=1) as db:
+            task = asyncio.create_task(db.get_endless_count())
+            await asyncio.sleep(0.2)
+            task.cancel()
+            started = time.perf_counter()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            waited = time.perf_counter() - started
+            # The slot is free again for the next call
+            return waited, await db.count_employees()
+
+    waited, count = asyncio.run(scenario())
+    assert waited < 2
+    assert count == 0
@@ -0,0 +1,83 @@
+import sqlite3
+import threading
+
+from connection_pool import ConnectionPool
+
+
+def _connection_in_thread(pool):
+    found = []
+    thread = threading.Thread(target=lambda: found.append(pool.connection()))
+    thread.start()
+    thread.join()
+    return found[0]
+
+
+def test_same_thread_reuses_its_connection(db_path):
+    pool = ConnectionPool(db_path)
+    assert pool.connection() is pool.connection()
+
+
+def test_threads_get_their_own_connections(db_path):
+    pool = ConnectionPool(db_path)
+    mine = pool.connection()
+    other = _connection_in_thread(pool)
+    assert other is not mine
+
+
+def test_finished_thread_connection_is_recycled(db_path):
+    pool = ConnectionPool(db_path)
+    first = _connection_in_thread(pool)
+    assert _connection_in_thread(pool) is first
+
+
+def test_recycled_connection_is_rolled_back(db_path):
+    pool = ConnectionPool(db_path)
+    setup = pool.connection()
+    setup.execute("CREATE TABLE t (x INTEGER)")
+    setup.commit()
+
+    def leave_open_transaction():
+        conn = pool.connection()
+        conn.execute("INSERT INTO t VALUES (1)")
+        assert conn.in_transaction
+
+    thread = threading.Thread(target=leave_open_transaction)
+    thread.start()
+    thread.join()
+
+    recycled = _connection_in_thread(pool)
+    assert not recycled.in_transaction
+    assert setup.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+
+
+def test_pragmas_are_applied(db_path):
+    pool = ConnectionPool(db_path, busy_timeout=1234)
+    conn = pool.connection()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 1234
+
+
+def test_trace_callback_sees_statements(db_path):
+    seen = []
+    pool = ConnectionPool(db_path, trace_callback=seen.append)
+    pool.connection().execute("SELECT 1")
+    assert "SELECT 1" in seen
+
+
+def test_idle_list_is_bounded(db_path):
+    pool = ConnectionPool(db_path, max_idle=1)
+    barrier = threading.Barrier(3)
+
+    def hold():
+        pool.connection()
+        barrier.wait()
+
+    threads = [threading.Thread(target=hold) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    pool.connection()
+    assert len(pool._idle) <= 1
+    assert isinstance(pool.connection(), sqlite3.Connection)
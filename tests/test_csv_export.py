@@ -0,0 +1,29 @@
+import csv
+import io
+
+import export_pipeline
+from csv_export import csv_bytes, iter_csv
+
+from tests.conftest import employee_data
+
+
+def test_iter_csv_yields_chunks():
+    chunks = list(iter_csv(["a"], ([i] for i in range(5)), rows_per_chunk=2))
+    assert len(chunks) == 3
+    assert b"".join(chunks) == b"a\n0\n1\n2\n3\n4\n"
+
+
+def test_csv_bytes_counts_rows():
+    data, count = csv_bytes(["name"], iter([["x"], ["y, z"]]))
+    assert count == 2
+    assert list(csv.reader(io.StringIO(data.decode()))) == [["name"], ["x"], ["y, z"]]
+
+
+def test_export_csv_builds_the_scope_export(manager, court_id, posts, monkeypatch):
+    monkeypatch.setattr(export_pipeline, "db_manager", manager)
+    manager.add_employee(employee_data(court_id, posts['Clerk'], name="Ram Kumar"))
+
+    rows = list(csv.DictReader(io.StringIO(export_pipeline.export_csv('court', court_id).decode())))
+    assert [row['Employee Name'] for row in rows] == ["Ram Kumar"]
+    assert rows[0]['Court Name'] == "Civil Court"
+    assert export_pipeline.build_export('court', court_id + 1)[1] == 0
@@ -0,0 +1,36 @@
+from datetime import date
+
+from tests.conftest import employee_data
+
+
+def test_vacancy_summary_matches_per_court_reads(manager, court_id, posts):
+    assert manager.add_court("Criminal Court", "2", "Officer", "Jind", 1)
+    courts = [court['court_id'] for court in manager.get_all_courts()]
+    for court in courts:
+        manager.update_post_vacancies(court, posts['Clerk'], 2)
+        manager.update_post_vacancies(court, posts['Peon'], 1)
+    manager.add_employee(employee_data(court_id, posts['Clerk']))
+    manager.add_employee(employee_data(court_id, posts['Peon']))
+
+    expected = sorted(
+        (court, post['post_name'], post['available_vacancies'])
+        for court in courts
+        for post in manager.get_court_posts_with_vacancies(court)
+        if post['available_vacancies'] > 0
+    )
+    summary = manager.get_vacancy_summary()
+    assert sorted((row['court_id'], row['post_name'], row['available_vacancies']) for row in summary) == expected
+    assert {row['division_name'] for row in summary} == {"Jind Sessions Court"}
+
+
+def test_dashboard_snapshot_matches_the_panel_getters(manager, court_id, posts):
+    manager.update_post_vacancies(court_id, posts['Clerk'], 2)
+    manager.add_employee(employee_data(court_id, posts['Clerk'], date_of_birth=date(1967, 3, 4)))
+    start, end = date(2025, 1, 1), date(2025, 12, 31)
+
+    snapshot = manager.get_dashboard_snapshot(start, end)
+    assert snapshot['summary'] == manager.get_system_summary()
+    assert snapshot['division_rollup'] == manager.get_division_rollup()
+    assert snapshot['divisions'] == manager.get_divisions_with_parent()
+    assert [row['name'] for row in snapshot['retirements']] == ["Ram Kumar"]
+    assert snapshot['retirements'] == manager.get_employees_retiring_between(start, end)
@@ -0,0 +1,64 @@
+import pytest
+
+
+@pytest.fixture
+def roster(manager, court_id, posts):
+    conn = manager.get_connection()
+    conn.execute("INSERT INTO posts (post_name, post_class) VALUES ('Unclassified', NULL)")
+    conn.commit()
+    unclassified = conn.execute("SELECT post_id FROM posts WHERE post_name = 'Unclassified'").fetchone()[0]
+
+    rows = []
+    for number in range(57):
+        post_id = (posts['Clerk'], posts['Peon'], posts['Judge'], unclassified)[number % 4]
+        # Repeated names make employee_id the tie-breaker
+        rows.append({'name': f"Employee {number % 9}", 'post_id': post_id, 'court_id': court_id})
+    result = manager.bulk_add_employees(rows)
+    assert result['inserted'] == 57
+    return manager
+
+
+def _reference_order(manager, court_id):
+    return [row[0] for row in manager.get_connection().execute("""
+        SELECT e.employee_id FROM employees e JOIN posts p ON e.post_id = p.post_id
+        WHERE e.court_id = ?
+        ORDER BY COALESCE(p.post_class, ''), e.name, e.employee_id
+    """, (court_id,))]
+
+
+def _all_pages(manager, limit, **kwargs):
+    pages, after = [], None
+    while True:
+        page = manager.list_employees(after=after, limit=limit, **kwargs)
+        pages.append([row['employee_id'] for row in page['rows']])
+        after = page['next_after']
+        if after is None:
+            return pages
+
+
+@pytest.mark.parametrize("limit", [1, 10, 25, 57, 100])
+def test_pages_cover_every_row_once_in_order(roster, court_id, limit):
+    pages = _all_pages(roster, limit, scope="court", scope_id=court_id)
+    assert [employee_id for page in pages for employee_id in page] == _reference_order(roster, court_id)
+    assert all(len(page) == limit for page in pages[:-1])
+
+
+def test_last_full_page_has_no_next_key(roster, court_id):
+    page = roster.list_employees(scope="court", scope_id=court_id, limit=57)
+    assert len(page['rows']) == 57
+    assert page['next_after'] is None
+
+
+def test_filters_and_search_apply_before_paging(roster, court_id, posts):
+    filtered = _all_pages(roster, 4, scope="court", scope_id=court_id, filters={'post_id': posts['Peon']})
+    assert sum(len(page) for page in filtered) == roster.count_employees("court", court_id, filters={'post_id': posts['Peon']})
+
+    found = _all_pages(roster, 3, scope="court", scope_id=court_id, search="Employee 4")
+    assert sum(len(page) for page in found) == roster.count_employees("court", court_id, search="Employee 4")
+
+
+def test_unknown_columns_are_rejected(roster):
+    with pytest.raises(ValueError):
+        roster.list_employees(columns=["name; DROP TABLE employees"])
+    # An unknown filter is reported like any other failed read
+    assert roster.list_employees(filters={'1=1 OR name': "x"}) == {'rows': [], 'next_after': None}
@@ -0,0 +1,120 @@
+import sqlite3
+
+from database_operations import DatabaseManager
+from query_cache import QueryCache, note_failure, request_scope
+
+from tests.conftest import employee_data
+
+
+def test_read_through_serves_hits():
+    cache = QueryCache()
+    calls = []
+    loader = lambda: calls.append(1) or [{'x': 1}]
+    assert cache.read_through("k", ("a",), loader) == [{'x': 1}]
+    assert cache.read_through("k", ("a",), loader) == [{'x': 1}]
+    assert len(calls) == 1
+    assert cache.stats()['hits'] == 1
+
+
+def test_invalidate_evicts_only_dependent_entries():
+    cache = QueryCache()
+    cache.read_through("a", ("courts",), lambda: 1)
+    cache.read_through("b", ("posts",), lambda: 2)
+    cache.invalidate(["courts"])
+    assert cache.read_through("a", ("courts",), lambda: 10) == 10
+    assert cache.read_through("b", ("posts",), lambda: 20) == 2
+
+
+def test_results_are_copied():
+    cache = QueryCache()
+    cache.read_through("k", ("a",), lambda: [{'x': 1}])[0]['x'] = 99
+    assert cache.read_through("k", ("a",), lambda: None) == [{'x': 1}]
+
+
+def test_failed_reads_are_not_stored():
+    cache = QueryCache()
+    cache.read_through("k", ("a",), lambda: note_failure() or [])
+    assert cache.read_through("k", ("a",), lambda: [1]) == [1]
+
+
+def test_lru_bound():
+    cache = QueryCache(max_entries=2)
+    for key in "abc":
+        cache.read_through(key, ("t",), lambda: key)
+    assert cache.stats()['entries'] == 2
+    assert cache.stats()['evictions'] == 1
+
+
+def test_data_version_change_clears_cache():
+    version = [1]
+    cache = QueryCache(data_version=lambda: version[0], poll_interval=0)
+    cache.read_through("k", ("a",), lambda: "old")
+    version[0] = 2
+    assert cache.read_through("k", ("a",), lambda: "new") == "new"
+
+
+def test_data_version_is_polled_once_per_interval():
+    polls = []
+    cache = QueryCache(data_version=lambda: polls.append(1) or 1, poll_interval=60)
+    for _ in range(5):
+        cache.read_through("k", ("a",), lambda: "value")
+    assert len(polls) == 1
+
+
+def test_own_commit_keeps_cache():
+    version = [1]
+    cache = QueryCache(data_version=lambda: version[0], poll_interval=0)
+    cache.read_through("k", ("a",), lambda: "old")
+    version[0] = 2
+    cache.own_commit(1, 2)
+    assert cache.read_through("k", ("a",), lambda: "new") == "old"
+
+
+def test_own_commit_after_an_outside_write_still_clears():
+    version = [1]
+    cache = QueryCache(data_version=lambda: version[0], poll_interval=0)
+    cache.read_through("k", ("a",), lambda: "old")
+    version[0] = 2  # committed elsewhere, not polled yet
+    version[0] = 3
+    cache.own_commit(2, 3)
+    assert cache.read_through("k", ("a",), lambda: "new") == "new"
+
+
+def test_local_write_keeps_unrelated_reads_cached(manager, court_id, posts):
+    manager.get_all_posts()
+    misses = manager.cache.stats()['misses']
+    assert manager.update_post_vacancies(court_id, posts['Clerk'], 3)
+    manager.get_all_posts()
+    assert manager.cache.stats()['misses'] == misses
+
+
+def test_manager_write_invalidates_its_getters(manager, court_id):
+    assert manager.get_court_details(court_id)['court_name'] == "Civil Court"
+    assert manager.update_court_details(court_id, "Renamed", "1", "Officer", "Jind")
+    assert manager.get_court_details(court_id)['court_name'] == "Renamed"
+
+
+def test_write_from_another_manager_is_seen(manager, court_id, db_path):
+    assert manager.get_all_courts()[0]['court_name'] == "Civil Court"
+    other = DatabaseManager(db_path, slow_query_log=None)
+    assert other.update_court_details(court_id, "Renamed Elsewhere", "1", "Officer", "Jind")
+    assert manager.get_all_courts()[0]['court_name'] == "Renamed Elsewhere"
+
+
+def test_write_from_a_plain_connection_is_seen(manager, court_id, posts, db_path):
+    assert manager.count_employees() == 0
+    conn = sqlite3.connect(db_path)
+    conn.execute("INSERT INTO employees (name, post_id, court_id) VALUES ('Outside', ?, ?)",
+                 (posts['Clerk'], court_id))
+    conn.commit()
+    conn.close()
+    assert manager.count_employees() == 1
+
+
+def test_request_scope_collapses_duplicates_and_sees_writes(manager, court_id, posts):
+    with request_scope() as scope:
+        manager.count_employees()
+        manager.count_employees()
+        assert scope.stats()['duplicates'] == 1
+        assert manager.add_employee(employee_data(court_id, posts['Clerk']))
+        assert manager.count_employees() == 1
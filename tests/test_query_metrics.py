@@ -0,0 +1,114 @@
+from query_metrics import MAX_FINGERPRINTS, QueryMetrics, QueryRecord, _current_call, fingerprint
+
+from tests.conftest import employee_data
+
+
+def _last(manager):
+    return manager.metrics.recent(1)[0]
+
+
+def test_fingerprint_replaces_literals():
+    assert fingerprint("SELECT * FROM t WHERE a = 'x''y' AND b = 42 AND c IN (?, ?, ?)") == \
+        "SELECT * FROM t WHERE a = ? AND b = ? AND c IN (?...)"
+
+
+def test_adding_one_employee_records_one_statement(manager, court_id, posts):
+    # The insert fires the count, stats, search and trigram triggers
+    manager.update_post_vacancies(court_id, posts['Clerk'], 2)
+    assert manager.add_employee(employee_data(court_id, posts['Clerk']))
+    record = _last(manager)
+    assert record['method'] == "add_employee"
+    assert record['statements'] == 1
+    assert record['fingerprint'].startswith("INSERT INTO employees")
+
+
+def test_transfer_and_terminate_record_one_statement_each(manager, court_id, posts):
+    manager.add_employee(employee_data(court_id, posts['Clerk']))
+    employee_id = manager.search_employees("Ram")[0]['employee_id']
+
+    manager.transfer_employee(employee_id, court_id, posts['Peon'])
+    assert _last(manager)['statements'] == 1
+    manager.terminate_employee(employee_id)
+    assert _last(manager)['statements'] == 1
+
+
+def _traced(statements):
+    metrics = QueryMetrics(slow_query_log=None)
+    record = QueryRecord("method", "test")
+    token = _current_call.set(record)
+    try:
+        for sql in statements:
+            metrics.trace(sql)
+    finally:
+        _current_call.reset(token)
+    return record
+
+
+def test_repeated_statements_with_new_values_are_counted_per_fingerprint():
+    record = _traced([f"INSERT INTO t (a, b) VALUES ({n}, 'x{n}')" for n in range(1000)])
+    assert record.statements == 1000
+    assert record.fingerprints == {"INSERT INTO t (a, b) VALUES (?...)": 1000}
+
+
+def test_trigger_repeats_and_internal_statements_are_skipped():
+    insert = "INSERT INTO t (a) VALUES (1)"
+    record = _traced(["BEGIN IMMEDIATE", insert, "-- PRAGMA 'main'.data_version", insert,
+                      "-- INSERT INTO 'main'.'t_fts_content' VALUES (1)", insert, "PRAGMA 'main'.data_version",
+                      insert, "SELECT k, v FROM 'main'.'t_fts_config'", "COMMIT"])
+    assert record.statements == 1
+
+
+def test_distinct_fingerprints_are_capped():
+    record = _traced([f"SELECT * FROM t{n}" for n in range(MAX_FINGERPRINTS + 10)])
+    assert record.statements == MAX_FINGERPRINTS + 10
+    assert len(record.fingerprints) == MAX_FINGERPRINTS
+
+
+def test_bulk_add_counts_one_insert_per_row(manager, court_id, posts):
+    rows = [{'name': f"Bulk {n}", 'post_id': posts['Clerk'], 'court_id': court_id} for n in range(50)]
+    assert manager.bulk_add_employees(rows)['inserted'] == 50
+    record = _last(manager)
+    assert record['rows'] == 50
+    assert 50 <= record['statements'] <= 52
+    # The trace is back on for later calls
+    manager.get_court_details(court_id)
+    assert _last(manager)['statements'] == 1
+
+
+def test_cache_hits_record_no_statements(manager, court_id):
+    manager.get_court_details(court_id)
+    assert _last(manager)['statements'] == 1
+    manager.get_court_details(court_id)
+    assert _last(manager)['statements'] == 0
+    assert manager.metrics.method_stats()['get_court_details']['calls'] == 2
+
+
+def test_nested_calls_count_towards_the_outer_call(manager, court_id):
+    manager.get_division_rollup()
+    assert _last(manager)['method'] == "get_division_rollup"
+    assert "get_court_rollup" not in manager.metrics.method_stats()
+
+
+def test_failed_calls_are_counted_and_logged(manager, court_id, caplog):
+    manager.get_connection().execute("DROP TABLE courts")
+    assert manager.get_court_details(court_id) == {}
+    record = _last(manager)
+    assert record['error'].startswith("Error fetching court details")
+    assert manager.metrics.method_stats()['get_court_details']['errors'] == 1
+
+
+def test_slow_calls_go_to_the_slow_query_log(db_path, tmp_path):
+    from database_operations import DatabaseManager
+    from tests.conftest import SCHEMA_PATH
+
+    log_path = tmp_path / "slow.log"
+    manager = DatabaseManager(db_path, slow_query_ms=0, slow_query_log=str(log_path))
+    manager.ensure_schema(SCHEMA_PATH)
+    manager.get_all_posts()
+    assert manager.metrics.method_stats()['get_all_posts']['slow'] == 1
+    assert "get_all_posts" in log_path.read_text()
+
+
+def test_callers_outside_the_app_are_named_by_thread(manager):
+    manager.get_all_posts()
+    assert _last(manager)['component'] == "MainThread"
@@ -0,0 +1,20 @@
+from reference_data import ReferenceRegistry, court_label
+
+from tests.conftest import employee_data
+
+
+def test_employee_writes_do_not_reload_the_registry(manager, court_id, posts):
+    registry = ReferenceRegistry(manager)
+    data = registry.current()
+    assert manager.add_employee(employee_data(court_id, posts['Clerk']))
+    assert manager.update_post_vacancies(court_id, posts['Clerk'], 2)
+    assert registry.current() is data
+    assert registry.loads == 1
+
+
+def test_reference_writes_reload_the_registry(manager, court_id):
+    registry = ReferenceRegistry(manager)
+    assert court_label(registry.current().courts_by_id[court_id]) == "Civil Court (Jind Sessions Court)"
+    assert manager.update_court_details(court_id, "Renamed", "1", "Officer", "Jind")
+    assert registry.current().courts_by_id[court_id]['court_name'] == "Renamed"
+    assert registry.loads == 2
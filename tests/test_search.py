@@ -0,0 +1,56 @@
+import pytest
+
+from tests.conftest import employee_data
+
+
+@pytest.fixture
+def staff(manager, court_id, posts):
+    for name, father in (("Rajesh Sharma", "Mohan Lal"), ("Sunil Kumar", "Ram Singh"), ("Anita Verma", "Vijay Verma")):
+        assert manager.add_employee(employee_data(court_id, posts['Clerk'], name=name, father_name=father))
+    return manager
+
+
+def test_search_matches_word_prefixes(staff):
+    assert [row['name'] for row in staff.search_employees("Shar")] == ["Rajesh Sharma"]
+    assert [row['name'] for row in staff.search_employees("verma")] == ["Anita Verma"]
+
+
+def test_search_is_scoped(staff, court_id):
+    assert staff.search_employees("Sunil", scope="court", scope_id=court_id)
+    assert staff.search_employees("Sunil", scope="court", scope_id=court_id + 1) == []
+
+
+def test_search_index_follows_updates_and_deletes(staff, posts):
+    employee_id = staff.search_employees("Sunil")[0]['employee_id']
+    employee = staff.get_employee(employee_id)
+    assert staff.update_employee(employee_id, employee_data(employee['court_id'], posts['Clerk'], name="Sunil Gupta"))
+    assert [row['name'] for row in staff.search_employees("Gupta")] == ["Sunil Gupta"]
+
+    staff.terminate_employee(employee_id)
+    assert staff.search_employees("Gupta") == []
+
+
+def test_suggestions_tolerate_typos(staff):
+    assert staff.search_employees("Sarma") == []
+    suggestions = staff.suggest_employees("Sarma")
+    assert suggestions[0]['name'] == "Rajesh Sharma"
+    assert suggestions[0]['similarity'] >= 0.3
+
+    assert staff.suggest_employees("Kumaar")[0]['name'] == "Sunil Kumar"
+
+
+def test_suggestions_match_father_names(staff):
+    assert staff.suggest_employees("Mohn Lal")[0]['name'] == "Rajesh Sharma"
+
+
+def test_suggestions_drop_weak_matches(staff):
+    assert staff.suggest_employees("Xyzzy") == []
+    assert staff.suggest_employees("") == []
+
+
+def test_trigram_index_follows_renames(staff, posts):
+    employee_id = staff.search_employees("Anita")[0]['employee_id']
+    employee = staff.get_employee(employee_id)
+    assert staff.update_employee(employee_id, employee_data(employee['court_id'], posts['Clerk'], name="Anita Malhotra"))
+    assert staff.suggest_employees("Malhtra")[0]['name'] == "Anita Malhotra"
+    assert all(row['name'] != "Anita Verma" for row in staff.suggest_employees("Anita Verma"))
@@ -0,0 +1,79 @@
+import io
+
+from tests.conftest import SCHEMA_PATH, employee_data
+
+
+
+def _export(manager, compression="gzip"):
+    buffer = io.BytesIO()
+    manifest = manager.export_database_snapshot(buffer, compression=compression)
+    assert manifest is not None
+    return buffer.getvalue(), manifest
+
+
+def test_export_skips_fts_shadow_tables(manager):
+    _, manifest = _export(manager)
+    assert not any(name.startswith(("employee_search", "employee_name_trigrams")) for name in manifest)
+    assert {"employees", "courts", "posts", "divisions"} <= set(manifest)
+
+
+def test_export_keeps_real_tables_sharing_a_virtual_table_prefix(manager):
+    conn = manager.get_connection()
+    conn.execute("CREATE TABLE employee_search_notes (note TEXT)")
+    conn.execute("INSERT INTO employee_search_notes VALUES ('keep me')")
+    conn.commit()
+
+    _, manifest = _export(manager)
+    assert manifest["employee_search_notes"]["rows"] == 1
+
+
+def _seed(manager, court_id, posts):
+    manager.update_post_vacancies(court_id, posts['Clerk'], 3)
+    for name in ("Ram Kumar", "Sita Devi", "O'Brien"):
+        assert manager.add_employee(employee_data(court_id, posts['Clerk'], name=name))
+
+
+def _restore(manager, data):
+    return manager.import_database_snapshot(io.BytesIO(data), schema_path=SCHEMA_PATH)
+
+
+def test_round_trip_restores_rows_and_derived_data(manager, court_id, posts):
+    _seed(manager, court_id, posts)
+    data, manifest = _export(manager)
+    assert manifest["employees"]["rows"] == 3
+
+    manager.terminate_employee(manager.search_employees("Sita")[0]['employee_id'])
+    assert manager.count_employees() == 2
+
+    assert _restore(manager, data)
+    assert manager.count_employees() == 3
+    assert [row['name'] for row in manager.search_employees("Sita")] == ["Sita Devi"]
+    assert manager.get_court_stats(court_id) == {'headcount': 3, 'sanctioned': 3, 'vacancies': 0}
+
+
+def test_plain_sql_round_trip(manager, court_id, posts):
+    _seed(manager, court_id, posts)
+    data, _ = _export(manager, compression=None)
+    assert data.startswith(b"-- Database Snapshot Export")
+    assert _restore(manager, data)
+    assert manager.count_employees() == 3
+
+
+def test_truncated_snapshot_is_rejected(manager, court_id, posts):
+    _seed(manager, court_id, posts)
+    data, _ = _export(manager, compression=None)
+    manager.add_employee(employee_data(court_id, posts['Clerk'], name="After Export"))
+
+    cut = data[:data.index(b"-- @manifest")]
+    assert not _restore(manager, cut)
+    assert not _restore(manager, data[:len(data) // 2])
+    assert manager.count_employees() == 4
+
+
+def test_tampered_snapshot_is_rejected(manager, court_id, posts):
+    _seed(manager, court_id, posts)
+    data, _ = _export(manager, compression=None)
+    assert b"Sita Devi" in data
+
+    assert not _restore(manager, data.replace(b"Sita Devi", b"Gita Devi"))
+    assert [row['name'] for row in manager.search_employees("Sita")] == ["Sita Devi"]
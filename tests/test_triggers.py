@@ -0,0 +1,114 @@
+from tests.conftest import employee_data
+
+
+def _stats_table(manager, table, key):
+    rows = manager.get_connection().execute(
+        f"SELECT {key}, headcount, sanctioned, vacancies FROM {table} ORDER BY {key}"
+    ).fetchall()
+    return rows
+
+
+def _active_count(manager, court_id, post_id):
+    row = manager.get_connection().execute(
+        "SELECT active_employees_count FROM post_courts WHERE court_id = ? AND post_id = ?",
+        (court_id, post_id)
+    ).fetchone()
+    return row[0] if row else None
+
+
+def _employee_ids(manager):
+    return [row[0] for row in manager.get_connection().execute("SELECT employee_id FROM employees ORDER BY employee_id")]
+
+
+def test_add_employee_applies_deltas(manager, court_id, posts):
+    assert manager.update_post_vacancies(court_id, posts['Clerk'], 3)
+    assert manager.add_employee(employee_data(court_id, posts['Clerk']))
+
+    assert _active_count(manager, court_id, posts['Clerk']) == 1
+    assert manager.get_court_stats(court_id) == {'headcount': 1, 'sanctioned': 3, 'vacancies': 2}
+    assert manager.get_division_stats(1) == {'headcount': 1, 'sanctioned': 3, 'vacancies': 2}
+
+
+def test_transfer_moves_counts_between_courts(manager, court_id, posts):
+    assert manager.add_court("Criminal Court", "2", "Officer", "Jind", 1)
+    other_court = max(court['court_id'] for court in manager.get_all_courts())
+    manager.update_post_vacancies(court_id, posts['Clerk'], 2)
+    manager.update_post_vacancies(other_court, posts['Peon'], 2)
+    manager.add_employee(employee_data(court_id, posts['Clerk']))
+
+    employee_id = _employee_ids(manager)[0]
+    assert manager.transfer_employee(employee_id, other_court, posts['Peon'])
+
+    assert _active_count(manager, court_id, posts['Clerk']) == 0
+    assert _active_count(manager, other_court, posts['Peon']) == 1
+    assert manager.get_court_stats(court_id)['headcount'] == 0
+    assert manager.get_court_stats(other_court) == {'headcount': 1, 'sanctioned': 2, 'vacancies': 1}
+    assert manager.get_division_stats(1)['headcount'] == 1
+
+
+def test_terminate_decrements_counts(manager, court_id, posts):
+    manager.update_post_vacancies(court_id, posts['Clerk'], 2)
+    manager.add_employee(employee_data(court_id, posts['Clerk']))
+    assert manager.terminate_employee(_employee_ids(manager)[0])
+
+    assert _active_count(manager, court_id, posts['Clerk']) == 0
+    assert manager.get_court_stats(court_id) == {'headcount': 0, 'sanctioned': 2, 'vacancies': 2}
+
+
+def test_post_allocated_after_employees_starts_from_their_count(manager, court_id, posts):
+    manager.add_employee(employee_data(court_id, posts['Clerk']))
+    manager.add_employee(employee_data(court_id, posts['Clerk'], name="Sita Devi"))
+    manager.update_post_vacancies(court_id, posts['Clerk'], 5)
+
+    assert _active_count(manager, court_id, posts['Clerk']) == 2
+    assert manager.get_court_stats(court_id)['vacancies'] == 3
+
+
+def test_insert_fills_retirement_date(manager, court_id, posts):
+    manager.add_employee(employee_data(court_id, posts['Clerk']))
+    retirement = manager.get_connection().execute("SELECT retirement_date FROM employees").fetchone()[0]
+    assert str(retirement) == "2028-05-31"
+
+
+def test_triggered_stats_match_a_full_rebuild(manager, court_id, posts):
+    manager.update_post_vacancies(court_id, posts['Clerk'], 4)
+    manager.update_post_vacancies(court_id, posts['Judge'], 1)
+    for name in ("A", "B", "C"):
+        manager.add_employee(employee_data(court_id, posts['Clerk'], name=name))
+    manager.terminate_employee(_employee_ids(manager)[0])
+
+    triggered = (_stats_table(manager, "court_stats", "court_id"), _stats_table(manager, "division_stats", "division_id"))
+    assert manager.rebuild_stats()
+    rebuilt = (_stats_table(manager, "court_stats", "court_id"), _stats_table(manager, "division_stats", "division_id"))
+    assert triggered == rebuilt
+
+
+def test_reconcile_reports_and_repairs_drift(manager, court_id, posts):
+    manager.update_post_vacancies(court_id, posts['Clerk'], 4)
+    manager.add_employee(employee_data(court_id, posts['Clerk']))
+    conn = manager.get_connection()
+    conn.execute("UPDATE post_courts SET active_employees_count = 3 WHERE court_id = ? AND post_id = ?",
+                 (court_id, posts['Clerk']))
+    conn.commit()
+
+    drift = manager.reconcile_active_employee_counts()
+    assert [(row['stored'], row['actual']) for row in drift] == [(3, 1)]
+    assert _active_count(manager, court_id, posts['Clerk']) == 3
+
+    manager.reconcile_active_employee_counts(fix=True)
+    assert manager.reconcile_active_employee_counts() == []
+    assert manager.get_court_stats(court_id) == {'headcount': 1, 'sanctioned': 4, 'vacancies': 3}
+
+
+def test_bulk_load_defers_maintenance_until_exit(manager, court_id, posts):
+    manager.update_post_vacancies(court_id, posts['Clerk'], 5)
+    with manager.bulk_load() as conn:
+        for name in ("Amar Singh", "Bhola Ram"):
+            conn.execute("INSERT INTO employees (name, post_id, court_id, date_of_birth) VALUES (?, ?, ?, '1970-05-17')",
+                         (name, posts['Clerk'], court_id))
+        assert _active_count(manager, court_id, posts['Clerk']) == 0
+
+    assert conn.execute("SELECT bulk_load FROM trigger_control").fetchone()[0] == 0
+    assert _active_count(manager, court_id, posts['Clerk']) == 2
+    assert manager.get_court_stats(court_id) == {'headcount': 2, 'sanctioned': 5, 'vacancies': 3}
+    assert [row['name'] for row in manager.search_employees("Amar")] == ["Amar Singh"]
@@ -0,0 +1,113 @@
+import sqlite3
+import threading
+
+import pytest
+
+from connection_pool import ConnectionPool
+from write_queue import WriteQueue
+
+
+@pytest.fixture
+def pool(db_path):
+    pool = ConnectionPool(db_path)
+    conn = pool.connection()
+    conn.execute("CREATE TABLE items (name TEXT UNIQUE)")
+    conn.commit()
+    return pool
+
+
+def _names(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return sorted(row[0] for row in conn.execute("SELECT name FROM items"))
+    finally:
+        conn.close()
+
+
+def _hold_writer(writer):
+    """Submit a job that blocks the writer until the returned event is set"""
+    started, release = threading.Event(), threading.Event()
+
+    def blocker(cursor):
+        started.set()
+        release.wait(5)
+
+    future = writer.submit(blocker)
+    assert started.wait(5)
+    return future, release
+
+
+def test_queued_jobs_commit_in_one_batch(pool, db_path):
+    writer = WriteQueue(pool)
+    held, release = _hold_writer(writer)
+    futures = [writer.submit(lambda cursor, n=n: cursor.execute("INSERT INTO items VALUES (?)", (f"item {n}",)).rowcount)
+               for n in range(10)]
+    release.set()
+
+    assert [future.result(5) for future in futures] == [1] * 10
+    held.result(5)
+    assert writer.stats()['largest_batch'] == 10
+    assert writer.stats()['batches'] == 2
+    assert len(_names(db_path)) == 10
+
+
+def test_failing_job_rolls_back_alone(pool, db_path):
+    writer = WriteQueue(pool)
+    held, release = _hold_writer(writer)
+    first = writer.submit(lambda cursor: cursor.execute("INSERT INTO items VALUES ('a')"))
+    duplicate = writer.submit(lambda cursor: [cursor.execute("INSERT INTO items VALUES ('b')"),
+                                              cursor.execute("INSERT INTO items VALUES ('a')")])
+    last = writer.submit(lambda cursor: cursor.execute("INSERT INTO items VALUES ('c')"))
+    release.set()
+
+    first.result(5)
+    last.result(5)
+    with pytest.raises(sqlite3.IntegrityError):
+        duplicate.result(5)
+    assert _names(db_path) == ["a", "c"]
+
+
+def test_result_is_visible_once_resolved(pool, db_path):
+    writer = WriteQueue(pool)
+    writer.execute("INSERT INTO items VALUES ('x')")
+    assert _names(db_path) == ["x"]
+
+
+def test_nested_submit_joins_the_open_transaction(pool, db_path):
+    writer = WriteQueue(pool)
+
+    def outer(cursor):
+        cursor.execute("INSERT INTO items VALUES ('outer')")
+        return writer.call(lambda inner: inner.execute("INSERT INTO items VALUES ('inner')").rowcount)
+
+    assert writer.call(outer) == 1
+    assert _names(db_path) == ["inner", "outer"]
+
+
+def test_writer_survives_a_connection_failure(pool, db_path, monkeypatch):
+    writer = WriteQueue(pool)
+    calls = []
+    checkout = ConnectionPool.connection
+
+    def flaky_connection(self):
+        calls.append(1)
+        if len(calls) == 1:
+            raise sqlite3.OperationalError("unable to open database file")
+        return checkout(self)
+
+    monkeypatch.setattr(ConnectionPool, "connection", flaky_connection)
+    with pytest.raises(sqlite3.OperationalError):
+        writer.submit(lambda cursor: cursor.execute("INSERT INTO items VALUES ('lost')")).result(5)
+
+    assert writer.submit(lambda cursor: cursor.execute("INSERT INTO items VALUES ('kept')").rowcount).result(5) == 1
+    assert _names(db_path) == ["kept"]
+
+
+def test_writer_survives_an_unexpected_error(pool, db_path, monkeypatch):
+    writer = WriteQueue(pool)
+    monkeypatch.setattr(writer, "_apply", lambda batch: (_ for _ in ()).throw(RuntimeError("boom")))
+    with pytest.raises(RuntimeError):
+        writer.submit(lambda cursor: None).result(5)
+
+    monkeypatch.undo()
+    assert writer.execute("INSERT INTO items VALUES ('after')") == 1
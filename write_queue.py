@@ -0,0 +1,153 @@
+import contextvars
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple
+
+from connection_pool import ConnectionPool
+
+# A write job receives the writer's cursor, runs its statements and returns a
+# result; it must not commit or roll back (the writer owns the transaction).
+WriteJob = Callable[[sqlite3.Cursor], object]
+
+
+class WriteQueue:
+    """Single writer thread that applies write jobs from a queue.
+
+    Session threads submit jobs and get a Future back. The writer takes every
+    job already waiting (up to max_batch) and runs them in one BEGIN IMMEDIATE
+    transaction, each inside its own SAVEPOINT, so a failing job rolls back
+    alone while the others commit together. Futures resolve only once the
+    transaction has committed. Because only this thread writes, sessions no
+    longer race each other for the write lock.
+
+    When data_version is given it is read once the write lock is held and
+    again after the commit, and on_commit(before, after) is called with both,
+    so the caller can tell this writer's commits from everyone else's.
+    """
+
+    def __init__(self, pool: ConnectionPool, max_batch: int = 64, busy_retries: int = 5,
+                 data_version: Optional[Callable[[], Optional[int]]] = None,
+                 on_commit: Optional[Callable[[Optional[int], Optional[int]], None]] = None):
+        self.pool = pool
+        self.max_batch = max_batch
+        self.busy_retries = busy_retries
+        self.data_version = data_version
+        self.on_commit = on_commit
+        self._jobs: "queue.Queue[Tuple[WriteJob, Future, contextvars.Context]]" = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self.batches = 0
+        self.jobs = 0
+        self.largest_batch = 0
+
+    def submit(self, job: WriteJob) -> Future:
+        """Queue a write job; the future resolves to its result after commit"""
+        future = Future()
+        if threading.current_thread() is self._thread:
+            # A job that writes more from inside the writer joins the open transaction
+            try:
+                future.set_result(job(self.pool.connection().cursor()))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        self._ensure_started()
+        # The job runs in the submitter's context so per-call state (query metrics) follows it
+        self._jobs.put((job, future, contextvars.copy_context()))
+        return future
+
+    def call(self, job: WriteJob):
+        """Run a write job on the writer thread and wait for its result"""
+        return self.submit(job).result()
+
+    def execute(self, sql: str, params: tuple = ()) -> int:
+        """Run one write statement on the writer thread; returns its rowcount"""
+        return self.call(lambda cursor: cursor.execute(sql, params).rowcount)
+
+    def stats(self) -> Dict:
+        """Jobs and transactions applied so far"""
+        return {
+            'jobs': self.jobs,
+            'batches': self.batches,
+            'largest_batch': self.largest_batch,
+            'queued': self._jobs.qsize(),
+        }
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+                thread.start()
+                self._thread = thread
+
+    def _run(self):
+        while True:
+            batch = [self._jobs.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._jobs.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._apply(batch)
+            except Exception as e:
+                # Keep the writer alive: a dead writer would leave every later call waiting forever
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _begin(self, conn: sqlite3.Connection):
+        """BEGIN IMMEDIATE, retrying while another process holds the write lock"""
+        for attempt in range(self.busy_retries):
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                return
+            except sqlite3.OperationalError as e:
+                if "locked" not in str(e) and "busy" not in str(e):
+                    raise
+                if attempt == self.busy_retries - 1:
+                    raise
+                time.sleep(0.05 * (attempt + 1))
+
+    def _apply(self, batch: List[Tuple[WriteJob, Future, contextvars.Context]]):
+        conn = None
+        outcomes = []
+        try:
+            conn = self.pool.connection()
+            self._begin(conn)
+            # No other connection can commit until ours does
+            version = self.data_version() if self.data_version is not None else None
+            cursor = conn.cursor()
+            for job, _, context in batch:
+                cursor.execute("SAVEPOINT write_job")
+                try:
+                    outcomes.append((True, context.run(job, cursor)))
+                    cursor.execute("RELEASE write_job")
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO write_job")
+                    cursor.execute("RELEASE write_job")
+                    outcomes.append((False, e))
+            conn.commit()
+        except Exception as e:
+            # No connection, or the transaction itself failed (lock timeout,
+            # disk error): nothing was written
+            if conn is not None and conn.in_transaction:
+                conn.rollback()
+            outcomes = [(False, e)] * len(batch)
+        else:
+            if self.on_commit is not None:
+                self.on_commit(version, self.data_version())
+
+        self.batches += 1
+        self.jobs += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        for (_, future, _), (ok, value) in zip(batch, outcomes):
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)